@@ -2,8 +2,146 @@
 # -*- coding: utf-8 -*-
 
 from playwright.sync_api import sync_playwright
-import json
-import pandas as pd
+import orjson
+import re
+import xlsxwriter
+
+try:
+    import httpx
+    from selectolax.parser import HTMLParser
+    from html_text import inner_text
+    FAST_PATH_AVAILABLE = True
+except ImportError:
+    FAST_PATH_AVAILABLE = False
+
+
+CPA_URL = 'https://adpot.kr/pc/camp/camp_cpa.html'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 캠페인 카드 셀렉터 (대기/추출에 공통 사용)
+CAMPAIGN_SELECTOR = 'a[href*="camp_view.html"]'
+
+# 페이지 안에서 모든 캠페인 카드를 한 번에 추출 (드라이버 왕복 1회)
+CARDS_JS = """els => els.map(el => ({
+    href: el.getAttribute('href'),
+    text: el.innerText,
+    img: el.querySelector('img')?.getAttribute('src'),
+    category: el.querySelector('.category, [class*="category"]')?.innerText,
+    title: el.querySelector('.title, [class*="title"]')?.innerText
+}))"""
+
+# 카드 텍스트 파싱용 정규식 (금액/단위가 다른 태그에 있어도 맞도록 사이 공백 허용)
+IDX_RE = re.compile(r'idx=([^&]+)')
+CPA_PRICE_RE = re.compile(r'CPA\s*[\d,]+\s*원')
+CONV_RE = re.compile(r'\[\s*평균\s*\d+\s*%\s*\]')
+REMAIN_RE = re.compile(r'오늘잔여\s*\d+')
+INCENTIVE_RE = re.compile(r'격려금[^\n]*')
+
+
+# 텍스트만 필요하므로 렌더링용 리소스는 받지 않음 (innerText 줄 구성이 CSS 에 따라 달라지므로 스타일시트는 받음)
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'other'}
+
+
+def block_resources(route):
+    """이미지/폰트/미디어 요청 차단"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def parse_cards(cards):
+    """추출한 카드 정보를 캠페인 데이터로 변환"""
+    campaigns = []
+
+    for data in cards:
+        if not data['href']:
+            continue
+
+        campaign_data = {}
+
+        text = data['text'] or ''
+
+        # 캠페인 ID 추출
+        m = IDX_RE.search(data['href'])
+        if m:
+            campaign_data['campaign_id'] = m.group(1)
+
+        # 이미지 URL
+        img_src = data['img']
+        if img_src is not None:
+            # 상대 경로를 절대 경로로 변환
+            if img_src.startswith('/'):
+                img_src = 'https://adpot.kr' + img_src
+            campaign_data['image_url'] = img_src
+
+        # 카테고리
+        if data['category'] is not None:
+            campaign_data['category'] = data['category'].strip()
+
+        # 제목
+        if data['title'] is not None:
+            campaign_data['title'] = data['title'].strip()
+
+        # CPA 가격
+        m = CPA_PRICE_RE.search(text)
+        if m:
+            campaign_data['cpa_price'] = m.group()
+
+        # 평균 전환율
+        m = CONV_RE.search(text)
+        if m:
+            campaign_data['avg_conversion_rate'] = m.group()
+
+        # 오늘 잔여
+        m = REMAIN_RE.search(text)
+        if m:
+            campaign_data['remaining_today'] = m.group()
+
+        # 격려금
+        m = INCENTIVE_RE.search(text)
+        if m:
+            campaign_data['incentive'] = m.group().strip()
+
+        campaigns.append(campaign_data)
+
+    return campaigns
+
+
+def scrape_cpa_list_fast():
+    """
+    브라우저 없이 HTTP 요청 + selectolax 로 CPA 캠페인 목록을 스크래핑
+    (서버 렌더링된 목록이 없거나 가격을 하나도 읽지 못하면 빈 리스트)
+    """
+    if not FAST_PATH_AVAILABLE:
+        return []
+
+    try:
+        response = httpx.get(CPA_URL, headers={'User-Agent': USER_AGENT}, timeout=10, follow_redirects=True)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"HTTP 요청 오류: {e}")
+        return []
+
+    tree = HTMLParser(response.text)
+    cards = []
+    for link in tree.css(CAMPAIGN_SELECTOR):
+        img = link.css_first('img')
+        category = link.css_first('.category, [class*="category"]')
+        title = link.css_first('.title, [class*="title"]')
+        cards.append({
+            'href': link.attributes.get('href'),
+            'text': inner_text(link),
+            'img': img.attributes.get('src') if img else None,
+            'category': inner_text(category) if category else None,
+            'title': inner_text(title) if title else None
+        })
+
+    # 가격을 하나도 읽지 못했으면 브라우저로 다시 스크래핑
+    campaigns = parse_cards(cards)
+    if not any('cpa_price' in campaign for campaign in campaigns):
+        return []
+    return campaigns
 
 
 def scrape_cpa_list():
@@ -13,73 +151,17 @@ def scrape_cpa_list():
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
+        page.route('**/*', block_resources)
 
         try:
-            # 페이지 로드
-            page.goto('https://adpot.kr/pc/camp/camp_cpa.html', wait_until='networkidle')
-
-            # 캠페인 카드 목록 가져오기
-            campaigns = []
-
-            # 캠페인 링크 요소들 찾기
-            campaign_links = page.locator('a[href*="camp_view.html"]').all()
-
-            for link in campaign_links:
-                try:
-                    campaign_data = {}
-
-                    # 캠페인 ID 추출
-                    href = link.get_attribute('href')
-                    if href and 'idx=' in href:
-                        campaign_data['campaign_id'] = href.split('idx=')[1].split('&')[0]
-
-                    # 이미지 URL
-                    img = link.locator('img').first
-                    if img.count() > 0:
-                        img_src = img.get_attribute('src')
-                        # 상대 경로를 절대 경로로 변환
-                        if img_src and img_src.startswith('/'):
-                            img_src = 'https://adpot.kr' + img_src
-                        campaign_data['image_url'] = img_src
-
-                    # 카테고리
-                    category = link.locator('.category, [class*="category"]').first
-                    if category.count() > 0:
-                        campaign_data['category'] = category.inner_text().strip()
-
-                    # 제목
-                    title = link.locator('.title, [class*="title"]').first
-                    if title.count() > 0:
-                        campaign_data['title'] = title.inner_text().strip()
-
-                    # CPA 가격
-                    cpa_price = link.locator('text=/CPA\\s*[\\d,]+원/').first
-                    if cpa_price.count() > 0:
-                        price_text = cpa_price.inner_text().strip()
-                        campaign_data['cpa_price'] = price_text
-
-                    # 평균 전환율
-                    conversion = link.locator('text=/\\[평균\\s*\\d+%\\]/').first
-                    if conversion.count() > 0:
-                        campaign_data['avg_conversion_rate'] = conversion.inner_text().strip()
-
-                    # 오늘 잔여
-                    remaining = link.locator('text=/오늘잔여\\s*\\d+/').first
-                    if remaining.count() > 0:
-                        campaign_data['remaining_today'] = remaining.inner_text().strip()
-
-                    # 격려금
-                    incentive = link.locator('text=/격려금/').first
-                    if incentive.count() > 0:
-                        campaign_data['incentive'] = incentive.inner_text().strip()
-
-                    campaigns.append(campaign_data)
-
-                except Exception as e:
-                    print(f"개별 캠페인 파싱 오류: {e}")
-                    continue
-
-            return campaigns
+            # 페이지 로드 (캠페인 카드가 DOM에 붙는 즉시 진행)
+            page.goto(CPA_URL, wait_until='domcontentloaded')
+            page.wait_for_selector(CAMPAIGN_SELECTOR, state='attached', timeout=10000)
+
+            # 캠페인 카드 정보를 한 번에 가져오기
+            cards = page.eval_on_selector_all(CAMPAIGN_SELECTOR, CARDS_JS)
+
+            return parse_cards(cards)
 
         except Exception as e:
             print(f"페이지 로드 오류: {e}")
@@ -89,26 +171,39 @@ def scrape_cpa_list():
             browser.close()
 
 
+def save_excel(campaigns, filename):
+    """캠페인 목록을 엑셀 파일로 저장 (행 단위 스트리밍)"""
+    # 컬럼 순서는 키가 처음 등장한 순서를 따름
+    headers = list(dict.fromkeys(k for c in campaigns for k in c))
+
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, headers)
+    for row, campaign in enumerate(campaigns, 1):
+        worksheet.write_row(row, 0, [campaign.get(h, '') for h in headers])
+    workbook.close()
+
+
 def main():
     print("ADPOT CPA 캠페인 목록 스크래핑 시작...")
-    campaigns = scrape_cpa_list()
+    # 서버 렌더링된 목록이면 브라우저 없이 처리, 아니면 Playwright 사용
+    campaigns = scrape_cpa_list_fast() or scrape_cpa_list()
 
     print(f"\n총 {len(campaigns)}개의 캠페인을 찾았습니다.\n")
 
     # JSON 형식으로 출력
-    print(json.dumps(campaigns, ensure_ascii=False, indent=2))
+    print(orjson.dumps(campaigns, option=orjson.OPT_INDENT_2).decode())
 
     # JSON 파일로 저장
-    with open('adpot_cpa_campaigns.json', 'w', encoding='utf-8') as f:
-        json.dump(campaigns, f, ensure_ascii=False, indent=2)
+    with open('adpot_cpa_campaigns.json', 'wb') as f:
+        f.write(orjson.dumps(campaigns, option=orjson.OPT_INDENT_2))
 
     print("\n결과가 'adpot_cpa_campaigns.json' 파일로 저장되었습니다.")
 
     # 엑셀 파일로 저장
     if campaigns:
-        df = pd.DataFrame(campaigns)
         excel_filename = 'adpot_cpa_campaigns.xlsx'
-        df.to_excel(excel_filename, index=False, engine='openpyxl')
+        save_excel(campaigns, excel_filename)
         print(f"결과가 '{excel_filename}' 파일로도 저장되었습니다.")
 
 
@@ -1,254 +1,287 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from playwright.sync_api import sync_playwright
-import json
+from playwright.async_api import async_playwright
+import asyncio
+import orjson
+import re
 import pandas as pd
 from datetime import datetime
 
+try:
+    import httpx
+    from selectolax.parser import HTMLParser
+    from html_text import inner_text
+    FAST_PATH_AVAILABLE = True
+except ImportError:
+    FAST_PATH_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+CPA_URL = 'https://dbsense.kr/pc/camp/camp_cpa.html'
+CPC_URL = 'https://dbsense.kr/pc/camp/camp_cpc.html'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 캠페인 카드 셀렉터 (대기/추출에 공통 사용)
+CAMPAIGN_SELECTOR = 'a[href*="camp_view.html"]'
+
+# 페이지 안에서 모든 캠페인 카드를 한 번에 추출 (드라이버 왕복 1회)
+CARDS_JS = """els => els.map(el => ({
+    href: el.getAttribute('href'),
+    text: el.innerText,
+    img: el.querySelector('img')?.getAttribute('src'),
+    alt: el.querySelector('img')?.getAttribute('alt'),
+    category: el.querySelector('.category, [class*="category"]')?.innerText,
+    title: el.querySelector('.title, [class*="title"]')?.innerText,
+    strong: el.querySelector('strong')?.innerText
+}))"""
+
+# 카드 텍스트 파싱용 정규식 (금액/단위가 다른 태그에 있어도 맞도록 사이 공백 허용)
+IDX_RE = re.compile(r'idx=([^&]+)')
+CPA_PRICE_RE = re.compile(r'CPA\s*[\d,]+\s*원')
+CPC_PRICE_RE = re.compile(r'CPC\s*[+\d,]+\s*원')
+CONV_RE = re.compile(r'\[\s*평균\s*\d+\s*%\s*\]')
+REMAIN_RE = re.compile(r'오늘잔여\s*\d+')
+INCENTIVE_RE = re.compile(r'격려금[^\n]*')
+
+# 제목 후보에서 제외할 줄 (가격/잔여/전환율 정보)
+_SKIP_RE = {
+    'CPA': re.compile('CPA|오늘잔여|평균|격려금'),
+    'CPC': re.compile('CPC|오늘잔여|평균')
+}
+
+# 목록 종류별로 카드 텍스트에서 뽑을 필드
+_TEXT_FIELDS = {
+    'CPA': (('cpa_price', CPA_PRICE_RE), ('avg_conversion_rate', CONV_RE),
+            ('remaining_today', REMAIN_RE), ('incentive', INCENTIVE_RE)),
+    'CPC': (('cpc_price', CPC_PRICE_RE), ('remaining_today', REMAIN_RE))
+}
+
+# 주요 키워드 목록
+_KEYWORDS = (
+    '이사', '이삿짐', '포장이사', '용달', '원룸이사',
+    '키성장', '성장판', '키크기', '성장',
+    '과외', '학원', '교육', '공부방',
+    '건강', '병원', '의원', '한의원', '침향',
+    '홈페이지', '웹사이트', '랜딩페이지', '온라인',
+    '렌탈', '대여', '구독',
+    '비교', '견적', '상담',
+    '비대면', '온라인상담'
+)
+# pyahocorasick 이 있으면 키워드 전체를 한 번에 훑는 오토마톤 사용
+if AHOCORASICK_AVAILABLE:
+    _KW_AUTOMATON = ahocorasick.Automaton()
+    for _kw in _KEYWORDS:
+        _KW_AUTOMATON.add_word(_kw, _kw)
+    _KW_AUTOMATON.make_automaton()
+
+
+# 텍스트만 필요하므로 렌더링용 리소스는 받지 않음 (innerText 줄 구성이 CSS 에 따라 달라지므로 스타일시트는 받음)
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'other'}
+
+
+async def block_resources(route):
+    """이미지/폰트/미디어 요청 차단"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 def extract_keywords(title):
     """제목에서 주요 키워드 추출"""
-    keywords = []
+    # '온라인상담' 안의 '온라인'처럼 겹치는 키워드도 모두 찾고, 순서는 키워드 목록 순서로 맞춤
+    if AHOCORASICK_AVAILABLE:
+        found = {keyword for _, keyword in _KW_AUTOMATON.iter(title)}
+        return ', '.join(keyword for keyword in _KEYWORDS if keyword in found)
+    return ', '.join(keyword for keyword in _KEYWORDS if keyword in title)
+
+
+async def fetch_html(client, url):
+    """목록 페이지 HTML 다운로드 (실패 시 빈 문자열)"""
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+    except httpx.HTTPError as e:
+        print(f"HTTP 요청 오류: {e}")
+        return ''
+
+
+def parse_html_cards(html):
+    """HTML 에서 캠페인 카드 정보 추출 (CARDS_JS 와 같은 형태)"""
+    cards = []
+    for link in HTMLParser(html).css(CAMPAIGN_SELECTOR):
+        img = link.css_first('img')
+        category = link.css_first('.category, [class*="category"]')
+        title = link.css_first('.title, [class*="title"]')
+        strong = link.css_first('strong')
+        cards.append({
+            'href': link.attributes.get('href'),
+            'text': inner_text(link),
+            'img': img.attributes.get('src') if img else None,
+            'alt': img.attributes.get('alt') if img else None,
+            'category': inner_text(category) if category else None,
+            'title': inner_text(title) if title else None,
+            'strong': inner_text(strong) if strong else None
+        })
+    return cards
+
+
+def parse_cards(cards, price_label):
+    """추출한 카드 정보를 CPA/CPC 캠페인 데이터로 변환"""
+    campaigns = []
+    skip_re = _SKIP_RE[price_label]
+    text_fields = _TEXT_FIELDS[price_label]
+
+    # 스크래핑 날짜/시간 (목록 전체에 동일하게 사용)
+    scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    for data in cards:
+        if not data['href']:
+            continue
+
+        campaign_data = {}
+
+        # 스크래핑 날짜/시간
+        campaign_data['scraped_at'] = scraped_at
+
+        # 캠페인 ID 추출
+        m = IDX_RE.search(data['href'])
+        if m:
+            campaign_data['campaign_id'] = m.group(1)
+
+        # 링크의 전체 텍스트
+        full_text = (data['text'] or '').strip()
+
+        # 이미지 URL
+        img_src = data['img']
+        if img_src is not None:
+            # 상대 경로를 절대 경로로 변환
+            if img_src.startswith('/'):
+                img_src = 'https://dbsense.kr' + img_src
+            campaign_data['image_url'] = img_src
+
+            # 이미지의 alt 속성에서 제목 가져오기
+            alt_text = data['alt']
+            if alt_text:
+                campaign_data['title'] = alt_text.strip()
+                campaign_data['keywords'] = extract_keywords(alt_text)
+
+        # 카테고리
+        if data['category'] is not None:
+            campaign_data['category'] = data['category'].strip()
+
+        # 제목 (여러 방법으로 시도)
+        if 'title' not in campaign_data:
+            # 방법 1: .title 클래스
+            if data['title'] is not None:
+                title_text = data['title'].strip()
+                campaign_data['title'] = title_text
+                campaign_data['keywords'] = extract_keywords(title_text)
+            # 방법 2: strong 태그
+            elif data['strong'] is not None:
+                title_text = data['strong'].strip()
+                campaign_data['title'] = title_text
+                campaign_data['keywords'] = extract_keywords(title_text)
+            # 방법 3: 전체 텍스트에서 추출
+            elif full_text:
+                lines = full_text.split('\n')
+                for line in lines:
+                    line = line.strip()
+                    if line and not skip_re.search(line) and line != campaign_data.get('category', ''):
+                        campaign_data['title'] = line
+                        campaign_data['keywords'] = extract_keywords(line)
+                        break
+
+        # 가격, 전환율, 잔여, 격려금 등 텍스트 필드
+        for key, pattern in text_fields:
+            m = pattern.search(full_text)
+            if m:
+                campaign_data[key] = m.group().strip()
+
+        campaigns.append(campaign_data)
+
+    return campaigns
+
+
+async def scrape_list_fast(client, url, price_label):
+    """
+    브라우저 없이 HTTP 요청 + selectolax 로 CPA/CPC 캠페인 목록을 스크래핑
+    (서버 렌더링된 목록이 없거나 가격을 하나도 읽지 못하면 빈 리스트 -> 브라우저로 다시 스크래핑)
+    """
+    html = await fetch_html(client, url)
+    if not html:
+        return []
+    campaigns = parse_cards(parse_html_cards(html), price_label)
+    price_key = f'{price_label.lower()}_price'
+    if not any(price_key in campaign for campaign in campaigns):
+        return []
+    return campaigns
 
-    # 주요 키워드 목록
-    keyword_patterns = [
-        '이사', '이삿짐', '포장이사', '용달', '원룸이사',
-        '키성장', '성장판', '키크기', '성장',
-        '과외', '학원', '교육', '공부방',
-        '건강', '병원', '의원', '한의원', '침향',
-        '홈페이지', '웹사이트', '랜딩페이지', '온라인',
-        '렌탈', '대여', '구독',
-        '비교', '견적', '상담',
-        '비대면', '온라인상담'
-    ]
 
-    for keyword in keyword_patterns:
-        if keyword in title:
-            keywords.append(keyword)
+async def scrape_list(context, url, price_label):
+    """
+    dbsense.kr CPA/CPC 목록 페이지에서 캠페인 목록을 스크래핑
+    """
+    page = await context.new_page()
 
-    return ', '.join(keywords) if keywords else ''
+    try:
+        # 페이지 로드 (캠페인 카드가 DOM에 붙는 즉시 진행)
+        await page.goto(url, wait_until='domcontentloaded')
+        await page.wait_for_selector(CAMPAIGN_SELECTOR, state='attached', timeout=10000)
 
+        # 캠페인 카드 정보를 한 번에 가져오기
+        cards = await page.eval_on_selector_all(CAMPAIGN_SELECTOR, CARDS_JS)
 
-def scrape_cpa_list():
-    """
-    https://dbsense.kr/pc/camp/camp_cpa.html 페이지에서 CPA 캠페인 목록을 스크래핑
-    """
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        try:
-            # 페이지 로드
-            page.goto('https://dbsense.kr/pc/camp/camp_cpa.html', wait_until='networkidle')
-
-            # 캠페인 카드 목록 가져오기
-            campaigns = []
-
-            # 전체 페이지의 텍스트 가져와서 확인
-            page_content = page.content()
-
-            # 캠페인 링크 요소들 찾기
-            campaign_links = page.locator('a[href*="camp_view.html"]').all()
-
-            for link in campaign_links:
-                try:
-                    campaign_data = {}
-
-                    # 스크래핑 날짜/시간
-                    campaign_data['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                    # 캠페인 ID 추출
-                    href = link.get_attribute('href')
-                    if href and 'idx=' in href:
-                        campaign_data['campaign_id'] = href.split('idx=')[1].split('&')[0]
-
-                    # 링크의 전체 텍스트 가져오기
-                    full_text = link.inner_text().strip()
-
-                    # 이미지 URL
-                    img = link.locator('img').first
-                    if img.count() > 0:
-                        img_src = img.get_attribute('src')
-                        # 상대 경로를 절대 경로로 변환
-                        if img_src and img_src.startswith('/'):
-                            img_src = 'https://dbsense.kr' + img_src
-                        campaign_data['image_url'] = img_src
-
-                        # 이미지의 alt 속성에서 제목 가져오기
-                        alt_text = img.get_attribute('alt')
-                        if alt_text:
-                            campaign_data['title'] = alt_text.strip()
-                            campaign_data['keywords'] = extract_keywords(alt_text)
-
-                    # 카테고리
-                    category = link.locator('.category, [class*="category"]').first
-                    if category.count() > 0:
-                        campaign_data['category'] = category.inner_text().strip()
-
-                    # 제목 (여러 방법으로 시도)
-                    if 'title' not in campaign_data:
-                        # 방법 1: .title 클래스
-                        title = link.locator('.title, [class*="title"]').first
-                        if title.count() > 0:
-                            title_text = title.inner_text().strip()
-                            campaign_data['title'] = title_text
-                            campaign_data['keywords'] = extract_keywords(title_text)
-                        # 방법 2: strong 태그
-                        elif link.locator('strong').count() > 0:
-                            title_text = link.locator('strong').first.inner_text().strip()
-                            campaign_data['title'] = title_text
-                            campaign_data['keywords'] = extract_keywords(title_text)
-                        # 방법 3: 전체 텍스트에서 추출
-                        elif full_text:
-                            lines = full_text.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if line and 'CPA' not in line and '오늘잔여' not in line and '평균' not in line and '격려금' not in line:
-                                    if line != campaign_data.get('category', ''):
-                                        campaign_data['title'] = line
-                                        campaign_data['keywords'] = extract_keywords(line)
-                                        break
-
-                    # CPA 가격
-                    cpa_price = link.locator('text=/CPA\\s*[\\d,]+원/').first
-                    if cpa_price.count() > 0:
-                        price_text = cpa_price.inner_text().strip()
-                        campaign_data['cpa_price'] = price_text
-
-                    # 평균 전환율
-                    conversion = link.locator('text=/\\[평균\\s*\\d+%\\]/').first
-                    if conversion.count() > 0:
-                        campaign_data['avg_conversion_rate'] = conversion.inner_text().strip()
-
-                    # 오늘 잔여
-                    remaining = link.locator('text=/오늘잔여\\s*\\d+/').first
-                    if remaining.count() > 0:
-                        campaign_data['remaining_today'] = remaining.inner_text().strip()
-
-                    # 격려금
-                    incentive = link.locator('text=/격려금/').first
-                    if incentive.count() > 0:
-                        campaign_data['incentive'] = incentive.inner_text().strip()
-
-                    campaigns.append(campaign_data)
-
-                except Exception as e:
-                    print(f"개별 캠페인 파싱 오류: {e}")
-                    continue
-
-            return campaigns
-
-        except Exception as e:
-            print(f"페이지 로드 오류: {e}")
-            return []
-
-        finally:
-            browser.close()
-
-
-def scrape_cpc_list():
+        return parse_cards(cards, price_label)
+
+    except Exception as e:
+        print(f"페이지 로드 오류: {e}")
+        return []
+
+    finally:
+        await page.close()
+
+
+async def scrape_all(scrape_type):
     """
-    https://dbsense.kr/pc/camp/camp_cpc.html 페이지에서 CPC 캠페인 목록을 스크래핑
+    CPA/CPC 페이지를 동시에 스크래핑
+    - HTTP 요청으로 먼저 시도하고, 비어 있는 목록만 브라우저 하나의 컨텍스트에서 다시 스크래핑
     """
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        try:
-            # 페이지 로드
-            page.goto('https://dbsense.kr/pc/camp/camp_cpc.html', wait_until='networkidle')
-
-            # 캠페인 카드 목록 가져오기
-            campaigns = []
-
-            # 캠페인 링크 요소들 찾기
-            campaign_links = page.locator('a[href*="camp_view.html"]').all()
-
-            for link in campaign_links:
-                try:
-                    campaign_data = {}
-
-                    # 스크래핑 날짜/시간
-                    campaign_data['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                    # 캠페인 ID 추출
-                    href = link.get_attribute('href')
-                    if href and 'idx=' in href:
-                        campaign_data['campaign_id'] = href.split('idx=')[1].split('&')[0]
-
-                    # 링크의 전체 텍스트 가져오기
-                    full_text = link.inner_text().strip()
-
-                    # 이미지 URL
-                    img = link.locator('img').first
-                    if img.count() > 0:
-                        img_src = img.get_attribute('src')
-                        # 상대 경로를 절대 경로로 변환
-                        if img_src and img_src.startswith('/'):
-                            img_src = 'https://dbsense.kr' + img_src
-                        campaign_data['image_url'] = img_src
-
-                        # 이미지의 alt 속성에서 제목 가져오기
-                        alt_text = img.get_attribute('alt')
-                        if alt_text:
-                            campaign_data['title'] = alt_text.strip()
-                            campaign_data['keywords'] = extract_keywords(alt_text)
-
-                    # 카테고리
-                    category = link.locator('.category, [class*="category"]').first
-                    if category.count() > 0:
-                        campaign_data['category'] = category.inner_text().strip()
-
-                    # 제목 (여러 방법으로 시도)
-                    if 'title' not in campaign_data:
-                        # 방법 1: .title 클래스
-                        title = link.locator('.title, [class*="title"]').first
-                        if title.count() > 0:
-                            title_text = title.inner_text().strip()
-                            campaign_data['title'] = title_text
-                            campaign_data['keywords'] = extract_keywords(title_text)
-                        # 방법 2: strong 태그
-                        elif link.locator('strong').count() > 0:
-                            title_text = link.locator('strong').first.inner_text().strip()
-                            campaign_data['title'] = title_text
-                            campaign_data['keywords'] = extract_keywords(title_text)
-                        # 방법 3: 전체 텍스트에서 추출
-                        elif full_text:
-                            lines = full_text.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if line and 'CPC' not in line and '오늘잔여' not in line and '평균' not in line:
-                                    if line != campaign_data.get('category', ''):
-                                        campaign_data['title'] = line
-                                        campaign_data['keywords'] = extract_keywords(line)
-                                        break
-
-                    # CPC 가격
-                    cpc_price = link.locator('text=/CPC\\s*[+\\d,]+원/').first
-                    if cpc_price.count() > 0:
-                        price_text = cpc_price.inner_text().strip()
-                        campaign_data['cpc_price'] = price_text
-
-                    # 오늘 잔여
-                    remaining = link.locator('text=/오늘잔여\\s*\\d+/').first
-                    if remaining.count() > 0:
-                        campaign_data['remaining_today'] = remaining.inner_text().strip()
-
-                    campaigns.append(campaign_data)
-
-                except Exception as e:
-                    print(f"개별 캠페인 파싱 오류: {e}")
-                    continue
-
-            return campaigns
-
-        except Exception as e:
-            print(f"페이지 로드 오류: {e}")
-            return []
-
-        finally:
-            browser.close()
+    lists = {'cpa': (CPA_URL, 'CPA'), 'cpc': (CPC_URL, 'CPC')}
+    kinds = [kind for kind in lists if scrape_type in [kind, 'both']]
+    for kind in kinds:
+        print(f"{kind.upper()} 캠페인 목록 스크래핑 시작...")
+
+    results = {}
+    if FAST_PATH_AVAILABLE:
+        async with httpx.AsyncClient(headers={'User-Agent': USER_AGENT}, timeout=10, follow_redirects=True) as client:
+            fetched = await asyncio.gather(*(scrape_list_fast(client, *lists[kind]) for kind in kinds))
+            results.update(zip(kinds, fetched))
+
+    # JS 렌더링이 필요한 경우에만 브라우저 실행
+    pending = [kind for kind in kinds if not results.get(kind)]
+    if pending:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+
+            try:
+                context = await browser.new_context()
+                await context.route('**/*', block_resources)
+
+                fetched = await asyncio.gather(*(scrape_list(context, *lists[kind]) for kind in pending))
+                results.update(zip(pending, fetched))
+
+            finally:
+                await browser.close()
+
+    return results.get('cpa', []), results.get('cpc', [])
 
 
 def main():
@@ -257,17 +290,12 @@ def main():
     # 명령행 인수로 스크래핑 타입 선택 (기본값: both)
     scrape_type = sys.argv[1] if len(sys.argv) > 1 else 'both'
 
-    cpa_campaigns = []
-    cpc_campaigns = []
+    cpa_campaigns, cpc_campaigns = asyncio.run(scrape_all(scrape_type))
 
     if scrape_type in ['cpa', 'both']:
-        print("CPA 캠페인 목록 스크래핑 시작...")
-        cpa_campaigns = scrape_cpa_list()
         print(f"총 {len(cpa_campaigns)}개의 CPA 캠페인을 찾았습니다.\n")
 
     if scrape_type in ['cpc', 'both']:
-        print("CPC 캠페인 목록 스크래핑 시작...")
-        cpc_campaigns = scrape_cpc_list()
         print(f"총 {len(cpc_campaigns)}개의 CPC 캠페인을 찾았습니다.\n")
 
     # 날짜별 파일명 생성
@@ -276,27 +304,26 @@ def main():
     # JSON 파일로 저장
     if cpa_campaigns:
         json_filename = f'cpa_campaigns_{date_str}.json'
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(cpa_campaigns, f, ensure_ascii=False, indent=2)
+        with open(json_filename, 'wb') as f:
+            f.write(orjson.dumps(cpa_campaigns, option=orjson.OPT_INDENT_2))
         print(f"CPA 결과가 '{json_filename}' 파일로 저장되었습니다.")
 
     if cpc_campaigns:
         json_filename = f'cpc_campaigns_{date_str}.json'
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(cpc_campaigns, f, ensure_ascii=False, indent=2)
+        with open(json_filename, 'wb') as f:
+            f.write(orjson.dumps(cpc_campaigns, option=orjson.OPT_INDENT_2))
         print(f"CPC 결과가 '{json_filename}' 파일로 저장되었습니다.")
 
     # 엑셀 파일로 저장 (CPA는 Sheet1, CPC는 Sheet2)
     excel_filename = f'campaigns_{date_str}.xlsx'
-    with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
+    with pd.ExcelWriter(excel_filename, engine='xlsxwriter') as writer:
         if cpa_campaigns:
             df_cpa = pd.DataFrame(cpa_campaigns)
             # 컬럼 순서 조정: 스크래핑 날짜, 키워드를 앞으로
             cols = ['scraped_at', 'keywords', 'title', 'category', 'campaign_id', 'cpa_price',
                     'avg_conversion_rate', 'remaining_today', 'incentive', 'image_url']
-            cols = [c for c in cols if c in df_cpa.columns]
-            df_cpa = df_cpa[cols]
-            df_cpa.to_excel(writer, sheet_name='CPA', index=False)
+            df_cpa.to_excel(writer, sheet_name='CPA', index=False,
+                           columns=[c for c in cols if c in df_cpa.columns])
             print(f"CPA 결과가 '{excel_filename}' 파일의 'CPA' 시트에 저장되었습니다.")
 
         if cpc_campaigns:
@@ -304,9 +331,8 @@ def main():
             # 컬럼 순서 조정: 스크래핑 날짜, 키워드를 앞으로
             cols = ['scraped_at', 'keywords', 'title', 'category', 'campaign_id', 'cpc_price',
                     'remaining_today', 'image_url']
-            cols = [c for c in cols if c in df_cpc.columns]
-            df_cpc = df_cpc[cols]
-            df_cpc.to_excel(writer, sheet_name='CPC', index=False)
+            df_cpc.to_excel(writer, sheet_name='CPC', index=False,
+                           columns=[c for c in cols if c in df_cpc.columns])
             print(f"CPC 결과가 '{excel_filename}' 파일의 'CPC' 시트에 저장되었습니다.")
 
 
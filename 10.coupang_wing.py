@@ -12,8 +12,9 @@ import os
 import csv
 import asyncio
 import webbrowser
-import random
+import threading
 from datetime import datetime
+from functools import partial
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QTabWidget, QLabel, QLineEdit,
                              QPushButton, QTableWidget, QTableWidgetItem,
@@ -24,248 +25,74 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
 try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+from coupang_scraper import CoupangScraper, PLAYWRIGHT_AVAILABLE, RESULT_FIELDS, RESULT_HEADERS
+
+
+# CSV 저장 시 쓰기 버퍼 크기 (write 호출 횟수 줄이기)
+CSV_BUFFER_SIZE = 1024 * 1024
 
 
 class CoupangScraperWorker(QThread):
-    """쿠팡 스크래핑 작업을 별도 스레드에서 처리"""
+    """
+    쿠팡 스크래핑 작업을 별도 스레드에서 처리
+    - 이벤트 루프 하나를 앱 종료 시까지 유지하고, 검색은 그 루프에 코루틴으로 전달
+    """
     progress = pyqtSignal(str)
     result = pyqtSignal(list)
     error = pyqtSignal(str)
 
-    def __init__(self, search_params):
+    def __init__(self):
         super().__init__()
-        self.search_params = search_params
+        self.loop = None
+        self.scraper = None
+        self._lock = None
+        self._ready = threading.Event()
 
     def run(self):
-        """스크래핑 실행"""
+        """이벤트 루프 실행 (stop() 호출 전까지 유지)"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.scraper = CoupangScraper(on_progress=self.progress.emit)
+        self._lock = asyncio.Lock()
+        self._ready.set()
+
+        self.loop.run_forever()
+        self.loop.close()
+
+    def submit(self, search_params):
+        """GUI 스레드에서 검색 작업 전달"""
+        self._ready.wait()
+        future = asyncio.run_coroutine_threadsafe(self._scrape(search_params), self.loop)
+        future.add_done_callback(self._on_done)
+
+    def stop(self):
+        """브라우저를 닫고 이벤트 루프 종료"""
+        if not self.isRunning():
+            return
+        self._ready.wait()
         try:
-            # asyncio 이벤트 루프 생성 및 실행
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            results = loop.run_until_complete(self.scrape_coupang())
-            loop.close()
-
-            self.result.emit(results)
+            asyncio.run_coroutine_threadsafe(self.scraper.close(), self.loop).result(timeout=10)
         except Exception as e:
-            self.error.emit(f"오류 발생: {str(e)}")
+            print(f"브라우저 종료 중 오류: {str(e)}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.wait()
 
-    async def random_delay(self, min_sec=None, max_sec=None):
-        """사람처럼 보이기 위한 랜덤 딜레이"""
-        if min_sec is None:
-            min_sec = self.search_params.get('min_delay', 2.0)
-        if max_sec is None:
-            max_sec = self.search_params.get('max_delay', 5.0)
-        delay = random.uniform(min_sec, max_sec)
-        await asyncio.sleep(delay)
-
-    async def smooth_scroll(self, page, scroll_amount=300):
-        """부드러운 스크롤 시뮬레이션"""
-        for _ in range(3):
-            await page.evaluate(f'window.scrollBy(0, {scroll_amount})')
-            await asyncio.sleep(random.uniform(0.3, 0.7))
-
-    async def human_like_mouse_move(self, page):
-        """사람처럼 마우스를 움직임"""
-        width = await page.evaluate('window.innerWidth')
-        height = await page.evaluate('window.innerHeight')
-        x = random.randint(100, width - 100)
-        y = random.randint(100, height - 100)
-        await page.mouse.move(x, y)
-        await asyncio.sleep(random.uniform(0.1, 0.3))
-
-    async def scrape_coupang(self):
-        """쿠팡 웹사이트 스크래핑 - 사람처럼 행동"""
-        results = []
-        query = self.search_params['query']
-        max_results = self.search_params.get('max_results', 20)
-        exclude_rocket = self.search_params.get('exclude_rocket', True)
-        exclude_rocket_direct = self.search_params.get('exclude_rocket_direct', True)
-        min_price = self.search_params.get('min_price', 0)
-        max_price = self.search_params.get('max_price', 999999999)
-
-        self.progress.emit(f"'{query}' 검색 중...")
-
-        async with async_playwright() as p:
-            # 브라우저 실행 - 실제 브라우저처럼 설정
-            browser = await p.chromium.launch(
-                headless=self.search_params.get('headless', True),
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
+    async def _scrape(self, search_params):
+        """검색은 한 번에 하나씩 실행 (브라우저는 계속 재사용)"""
+        async with self._lock:
+            return await self.scraper.search(search_params)
 
-            # 프록시 설정
-            context_options = {
-                'viewport': {'width': 1920, 'height': 1080},
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'locale': 'ko-KR',
-                'timezone_id': 'Asia/Seoul'
-            }
-
-            # 프록시 사용 시
-            if self.search_params.get('use_proxy', False) and self.search_params.get('proxy_server'):
-                proxy_server = self.search_params.get('proxy_server')
-                self.progress.emit(f"프록시 사용: {proxy_server}")
-                context_options['proxy'] = {'server': proxy_server}
-
-            # 새 컨텍스트 생성 - 실제 사용자처럼
-            context = await browser.new_context(**context_options)
-
-            # 웹드라이버 감지 방지
-            await context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-
-                window.navigator.chrome = {
-                    runtime: {}
-                };
-
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['ko-KR', 'ko', 'en-US', 'en']
-                });
-            """)
-
-            page = await context.new_page()
-
-            try:
-                # 쿠팡 메인 페이지 먼저 방문 (실제 사용자처럼)
-                self.progress.emit("쿠팡 메인 페이지 접속 중...")
-                await page.goto("https://www.coupang.com", timeout=60000)
-
-                # 초기 대기 시간 (IP 차단 방지)
-                initial_wait = self.search_params.get('initial_wait', 3.0)
-                self.progress.emit(f"페이지 로딩 대기 중... ({initial_wait:.1f}초)")
-                await asyncio.sleep(initial_wait)
-                await self.random_delay()
-
-                # 마우스 움직임 시뮬레이션
-                await self.human_like_mouse_move(page)
-
-                # 검색 페이지로 이동
-                search_url = f"https://www.coupang.com/np/search?q={query}"
-                self.progress.emit(f"'{query}' 검색 중...")
-
-                await page.goto(search_url, wait_until='domcontentloaded', timeout=60000)
-                await self.random_delay()  # 설정된 딜레이 사용
-
-                # 페이지를 천천히 스크롤 (실제 사람처럼)
-                self.progress.emit("페이지 스크롤 중...")
-                scroll_delay = self.search_params.get('scroll_delay', 1.5)
-                await self.smooth_scroll(page, 200)
-                await asyncio.sleep(scroll_delay)
-
-                # 제품 목록이 로딩될 때까지 대기
-                await page.wait_for_selector('li.search-product', timeout=30000)
-
-                self.progress.emit("제품 정보 수집 중...")
-
-                # 제품 목록 가져오기
-                products = await page.query_selector_all('li.search-product')
-
-                if not products:
-                    self.progress.emit("검색 결과가 없습니다.")
-                    await browser.close()
-                    return results
-
-                self.progress.emit(f"{len(products)}개 제품 발견. 필터링 중...")
-
-                for idx, product in enumerate(products[:max_results * 2]):  # 필터링을 고려해 더 많이 수집
-                    try:
-                        # 각 제품을 볼 때마다 짧은 딜레이 (사람처럼)
-                        if idx % 5 == 0 and idx > 0:
-                            await self.random_delay(0.5, 1.5)
-                            # 가끔 마우스 움직임
-                            await self.human_like_mouse_move(page)
-                        # 로켓배송 체크
-                        is_rocket = await product.query_selector('.badge.rocket') is not None
-                        is_rocket_direct = await product.query_selector('.badge.rocket-direct') is not None
-                        is_rocket_global = await product.query_selector('.badge.rocket-global') is not None
-                        is_rocket_fresh = await product.query_selector('.badge.rocket-fresh') is not None
-
-                        # 필터링 조건 체크
-                        if exclude_rocket and is_rocket:
-                            continue
-                        if exclude_rocket_direct and (is_rocket_direct or is_rocket_global or is_rocket_fresh):
-                            continue
-
-                        # 제품 정보 추출
-                        name_elem = await product.query_selector('.name')
-                        name = await name_elem.inner_text() if name_elem else "제목 없음"
-
-                        price_elem = await product.query_selector('.price-value')
-                        price_text = await price_elem.inner_text() if price_elem else "0"
-                        price = int(price_text.replace(',', '').replace('원', '').strip())
-
-                        # 가격 필터링
-                        if price < min_price or price > max_price:
-                            continue
-
-                        # 링크 추출
-                        link_elem = await product.query_selector('a.search-product-link')
-                        product_url = ""
-                        if link_elem:
-                            href = await link_elem.get_attribute('href')
-                            if href:
-                                product_url = f"https://www.coupang.com{href}" if href.startswith('/') else href
-
-                        # 평점 추출
-                        rating_elem = await product.query_selector('.rating')
-                        rating = await rating_elem.inner_text() if rating_elem else "N/A"
-
-                        # 리뷰 수 추출
-                        review_elem = await product.query_selector('.rating-total-count')
-                        review_count = await review_elem.inner_text() if review_elem else "0"
-
-                        # 판매자 정보
-                        seller_type = "일반 판매자"
-                        if is_rocket:
-                            seller_type = "로켓배송"
-                        elif is_rocket_direct:
-                            seller_type = "로켓직구"
-                        elif is_rocket_global:
-                            seller_type = "로켓글로벌"
-                        elif is_rocket_fresh:
-                            seller_type = "로켓프레시"
-
-                        results.append({
-                            'name': name.strip(),
-                            'price': price,
-                            'seller_type': seller_type,
-                            'rating': rating.strip(),
-                            'review_count': review_count.strip(),
-                            'url': product_url
-                        })
-
-                        self.progress.emit(f"처리 중... {len(results)}개 일반 판매자 제품 발견")
-
-                        # 목표 개수 달성 시 중단
-                        if len(results) >= max_results:
-                            break
-
-                    except Exception as e:
-                        self.progress.emit(f"제품 처리 중 오류: {str(e)}")
-                        continue
-
-                # 가격 순으로 정렬
-                results.sort(key=lambda x: x['price'])
-
-            except Exception as e:
-                self.progress.emit(f"페이지 처리 중 오류: {str(e)}")
-            finally:
-                await browser.close()
-
-        return results
+    def _on_done(self, future):
+        """검색 결과/오류를 시그널로 GUI에 전달"""
+        try:
+            self.result.emit(future.result())
+        except Exception as e:
+            self.error.emit(f"오류 발생: {str(e)}")
 
 
 class CoupangWingFinder(QMainWindow):
@@ -275,6 +102,21 @@ class CoupangWingFinder(QMainWindow):
         self.load_config()
         self.init_ui()
 
+        # 스크래핑 스레드는 앱 실행 동안 하나만 유지 (브라우저 재사용)
+        self.worker = None
+        if PLAYWRIGHT_AVAILABLE:
+            self.worker = CoupangScraperWorker()
+            self.worker.progress.connect(self.on_progress)
+            self.worker.result.connect(self.on_search_complete)
+            self.worker.error.connect(self.on_search_error)
+            self.worker.start()
+
+    def closeEvent(self, event):
+        """앱 종료 시 브라우저 정리"""
+        if self.worker is not None:
+            self.worker.stop()
+        super().closeEvent(event)
+
     def load_config(self):
         """설정 파일 로드"""
         default_config = {
@@ -292,19 +134,29 @@ class CoupangWingFinder(QMainWindow):
             'initial_wait': 3.0
         }
 
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = {**default_config, **json.load(f)}
-            except:
-                self.config = default_config
-        else:
-            self.config = default_config
+        # 저장된 설정으로 기본값 덮어쓰기 (파일이 없거나 깨졌으면 기본값 사용)
+        try:
+            with open(self.config_file, 'rb') as f:
+                data = f.read()
+            default_config.update(orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"설정 파일 로드 중 오류: {str(e)}")
+
+        self.config = default_config
 
     def save_config(self):
-        """설정 파일 저장"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, ensure_ascii=False, indent=2)
+        """설정 파일 저장 (임시 파일에 쓴 뒤 교체하여 중간에 꺼져도 안전)"""
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(self.config, ensure_ascii=False, indent=2).encode('utf-8')
+
+        tmp_file = self.config_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.config_file)
 
     def update_proxy_status_display(self):
         """프록시 상태 표시 업데이트"""
@@ -424,7 +276,7 @@ class CoupangWingFinder(QMainWindow):
                         background-color: #e0e0e0;
                     }
                 """)
-                btn.clicked.connect(lambda checked, k=keyword: self.set_keyword(k))
+                btn.clicked.connect(partial(self.set_keyword, keyword))
                 category_layout.addWidget(btn)
 
             category_layout.addStretch()
@@ -445,8 +297,8 @@ class CoupangWingFinder(QMainWindow):
 
         self.tabs.addTab(tab, "검색")
 
-    def set_keyword(self, keyword):
-        """검색 키워드 설정"""
+    def set_keyword(self, keyword, *_):
+        """검색 키워드 설정 (clicked 시그널의 checked 인자는 무시)"""
         self.keyword_input.setText(keyword)
         self.statusBar().showMessage(f"키워드 선택: {keyword}")
 
@@ -595,21 +447,23 @@ class CoupangWingFinder(QMainWindow):
 
         # 결과 테이블
         self.results_table = QTableWidget()
-        self.results_table.setColumnCount(7)
-        self.results_table.setHorizontalHeaderLabels([
-            '제품명', '가격', '판매자 유형', '평점', '리뷰 수', 'URL', '바로가기'
-        ])
+        self.results_table.setColumnCount(8)
+        self.results_table.setHorizontalHeaderLabels([*RESULT_HEADERS, '바로가기'])
 
         # 테이블 설정
         header = self.results_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Stretch)
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(6, QHeaderView.ResizeToContents)
 
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setSelectionBehavior(QTableWidget.SelectRows)
 
+        # 바로가기 열 클릭 시 URL 열기 (행마다 버튼을 만들지 않음)
+        self.results_table.cellClicked.connect(self.open_result_url)
+
         layout.addWidget(self.results_table)
 
         # 버튼
@@ -646,14 +500,18 @@ class CoupangWingFinder(QMainWindow):
             QMessageBox.warning(self, "경고", "검색 키워드를 입력하세요")
             return
 
+        # 쉼표로 구분된 여러 키워드는 동시에 검색
+        queries = [k.strip() for k in keyword.split(',') if k.strip()]
+
         search_params = {
-            'query': keyword,
+            'query': queries,
             'max_results': self.max_results_spin.value(),
             'exclude_rocket': self.exclude_rocket_check.isChecked(),
             'exclude_rocket_direct': self.exclude_rocket_direct_check.isChecked(),
             'min_price': self.min_price_spin.value(),
             'max_price': self.max_price_spin.value(),
             'headless': self.headless_check.isChecked(),
+            'fast_mode': self.headless_check.isChecked(),
             'use_proxy': self.use_proxy_check.isChecked(),
             'proxy_server': self.proxy_input.text().strip(),
             'min_delay': self.min_delay_spin.value(),
@@ -672,11 +530,7 @@ class CoupangWingFinder(QMainWindow):
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
 
-        self.worker = CoupangScraperWorker(search_params)
-        self.worker.progress.connect(self.on_progress)
-        self.worker.result.connect(self.on_search_complete)
-        self.worker.error.connect(self.on_search_error)
-        self.worker.start()
+        self.worker.submit(search_params)
 
     def on_progress(self, message):
         """진행 상황 업데이트"""
@@ -706,46 +560,56 @@ class CoupangWingFinder(QMainWindow):
 
     def display_results(self, results):
         """결과를 테이블에 표시"""
-        self.results_table.setRowCount(len(results))
+        table = self.results_table
 
-        for row, result in enumerate(results):
-            self.results_table.setItem(row, 0, QTableWidgetItem(result['name']))
-            self.results_table.setItem(row, 1, QTableWidgetItem(f"{result['price']:,}원"))
-            self.results_table.setItem(row, 2, QTableWidgetItem(result['seller_type']))
-            self.results_table.setItem(row, 3, QTableWidgetItem(result['rating']))
-            self.results_table.setItem(row, 4, QTableWidgetItem(result['review_count']))
-            self.results_table.setItem(row, 5, QTableWidgetItem(result['url']))
+        # 채우는 동안 정렬/다시 그리기/시그널 중지
+        table.setSortingEnabled(False)
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
 
-            # 바로가기 버튼
-            open_btn = QPushButton("🔗 열기")
-            open_btn.clicked.connect(lambda checked, u=result['url']: webbrowser.open(u))
-            self.results_table.setCellWidget(row, 6, open_btn)
+        try:
+            table.setRowCount(len(results))
+
+            for row, result in enumerate(results):
+                table.setItem(row, 0, QTableWidgetItem(result['query']))
+                table.setItem(row, 1, QTableWidgetItem(result['name']))
+                table.setItem(row, 2, QTableWidgetItem(f"{result['price']:,}원"))
+                table.setItem(row, 3, QTableWidgetItem(result['seller_type']))
+                table.setItem(row, 4, QTableWidgetItem(result['rating']))
+                table.setItem(row, 5, QTableWidgetItem(result['review_count']))
+                table.setItem(row, 6, QTableWidgetItem(result['url']))
+
+                # 바로가기 (클릭 시 open_result_url 에서 처리)
+                table.setItem(row, 7, QTableWidgetItem("🔗 열기"))
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
 
         # 자동 저장
-        self.auto_save_results()
+        self.auto_save_results(results)
+
+    def open_result_url(self, row, column):
+        """바로가기 열을 클릭하면 해당 행의 URL 열기"""
+        if column != 7:
+            return
+        item = self.results_table.item(row, 6)
+        if item and item.text():
+            webbrowser.open(item.text())
 
-    def auto_save_results(self):
-        """결과 자동 저장"""
+    def auto_save_results(self, results):
+        """결과 자동 저장 (테이블 대신 결과 목록에서 바로 기록)"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'coupang_results_{timestamp}.csv'
 
-            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.writer(f)
+            with open(filename, 'w', encoding='utf-8-sig', newline='', buffering=CSV_BUFFER_SIZE) as f:
+                writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
 
-                # 헤더
-                headers = []
-                for col in range(self.results_table.columnCount() - 1):
-                    headers.append(self.results_table.horizontalHeaderItem(col).text())
-                writer.writerow(headers)
-
-                # 데이터
-                for row in range(self.results_table.rowCount()):
-                    row_data = []
-                    for col in range(self.results_table.columnCount() - 1):
-                        item = self.results_table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                # 헤더 (테이블 열 이름과 동일)
+                writer.writerow(dict(zip(RESULT_FIELDS, RESULT_HEADERS)))
+
+                # 데이터 (가격은 테이블/내보내기와 같은 "12,000원" 형식)
+                writer.writerows({**result, 'price': f"{result['price']:,}원"} for result in results)
 
             self.statusBar().showMessage(f"결과가 자동으로 저장되었습니다: {filename}", 3000)
         except Exception as e:
@@ -790,22 +654,20 @@ class CoupangWingFinder(QMainWindow):
             return
 
         try:
-            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+            with open(filename, 'w', encoding='utf-8-sig', newline='', buffering=CSV_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
+                ncols = self.results_table.columnCount() - 1
 
                 # 헤더
-                headers = []
-                for col in range(self.results_table.columnCount() - 1):
-                    headers.append(self.results_table.horizontalHeaderItem(col).text())
-                writer.writerow(headers)
-
-                # 데이터
-                for row in range(self.results_table.rowCount()):
-                    row_data = []
-                    for col in range(self.results_table.columnCount() - 1):
-                        item = self.results_table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                header = self.results_table.horizontalHeaderItem
+                writer.writerow([header(col).text() for col in range(ncols)])
+
+                # 데이터 (한 번에 기록)
+                item = self.results_table.item
+                writer.writerows(
+                    [(cell.text() if (cell := item(row, col)) else "") for col in range(ncols)]
+                    for row in range(self.results_table.rowCount())
+                )
 
             QMessageBox.information(self, "알림", f"결과가 {filename}로 저장되었습니다")
             self.statusBar().showMessage(f"결과 내보내기 완료: {filename}")
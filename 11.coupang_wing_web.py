@@ -7,17 +7,27 @@
 - 로그 표시 기능
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 import asyncio
+import atexit
 import json
 import os
+import io
 import csv
+import random
+import re
+import time
 import traceback
+from collections import OrderedDict, deque
 from datetime import datetime
-from threading import Thread
+from operator import itemgetter
+from urllib.parse import quote
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 try:
     from playwright.async_api import async_playwright
@@ -31,10 +41,31 @@ try:
 except ImportError:
     STEALTH_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+from coupang_scraper import block_resources
+from socketio_json import socketio_json_module
+
+
 # Flask 앱 설정
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'coupang-crawler-secret-key'
-socketio = SocketIO(app, cors_allowed_origins="*")
+# 디버그 모드는 FLASK_DEBUG=1 일 때만 사용 (리로더, Socket.IO 상세 로그)
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+# 스크래핑 루프 스레드에서 바로 emit 하므로 threading 모드로 고정
+# (eventlet/gevent 가 설치되어 있어도 자동 선택되지 않도록, 웹소켓은 simple-websocket 설치 시 사용)
+socketio = SocketIO(app, async_mode='threading', cors_allowed_origins="*", logger=DEBUG, engineio_logger=DEBUG,
+                    json=socketio_json_module())
 
 # 로깅 설정
 if not os.path.exists('logs'):
@@ -45,16 +76,104 @@ file_handler.setFormatter(logging.Formatter(
     '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
 ))
 file_handler.setLevel(logging.INFO)
-app.logger.addHandler(file_handler)
+# 로그 기록은 큐에 넣기만 하고, 파일 쓰기는 별도 리스너 스레드에서 처리
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+app.logger.addHandler(QueueHandler(log_queue))
 app.logger.setLevel(logging.INFO)
 app.logger.info('쿠팡 크롤러 웹 시작')
 
 # 설정 파일
 CONFIG_FILE = 'coupang_wing_config.json'
 
-# 전역 변수
-scraping_results = []
-is_scraping = False
+# 결과 필드 (내부에서는 이 순서의 튜플로 저장하고, API 응답 시에만 dict로 변환)
+FIELDS = ('rank', 'name', 'price', 'seller_type', 'rating', 'review_count', 'url')
+_PRICE_KEY = itemgetter(FIELDS.index('price'))
+
+# 실시간 결과 전송 묶음 크기와 최대 간격(초)
+RESULT_EMIT_BATCH = 5
+RESULT_EMIT_INTERVAL = 0.25
+
+# 실시간 로그 전송 간격(초)과 전송 대기 로그 최대 개수 (넘으면 오래된 것부터 버림)
+LOG_FLUSH_INTERVAL = 0.1
+LOG_BUFFER_SIZE = 1000
+
+# 같은 검색 조건의 결과를 재사용하는 시간(초)과 최대 보관 개수
+RESULT_CACHE_TTL = 180
+RESULT_CACHE_SIZE = 128
+
+# 로그 조회 시 파일 끝에서 읽을 크기와 줄 수
+LOG_TAIL_BYTES = 64 * 1024
+LOG_TAIL_LINES = 100
+
+# 가격 문자열의 첫 번째 숫자 (쉼표 포함, "1+1" 같은 다른 숫자와 이어 붙이지 않음)
+_PRICE_RE = re.compile(r'\d[\d,]*')
+
+# 검색 결과 카드에서 필요한 정보를 브라우저 안에서 한 번에 추출
+PRODUCTS_JS = """
+() => Array.from(document.querySelectorAll('li.search-product')).map(el => {
+    // 배지 클래스는 한 번만 모아서 판매자 유형을 판별
+    const badges = new Set(Array.from(el.querySelectorAll('.badge'), b => b.className).join(' ').split(' '));
+    return {
+        isAd: el.className.includes('search-product__ad'),
+        name: el.querySelector('.name')?.textContent.trim() || '',
+        price: el.querySelector('.price-value')?.textContent.trim() || '0',
+        rocket: badges.has('rocket'),
+        rocketDirect: badges.has('rocket-direct'),
+        rocketGlobal: badges.has('rocket-global'),
+        rocketFresh: badges.has('rocket-fresh'),
+        href: el.querySelector('a.search-product-link')?.getAttribute('href') || '',
+        rating: el.querySelector('.rating')?.textContent.trim() || 'N/A',
+        reviewCount: el.querySelector('.rating-total-count')?.textContent.trim() || '0'
+    };
+})
+"""
+
+# 부드러운 스크롤 (약간의 랜덤성을 추가하여 자연스럽게, 한 번의 호출로 끝까지 실행)
+SMOOTH_SCROLL_JS = """
+async ({start, end, steps}) => {
+    if (end === null) end = document.body.scrollHeight;
+    const stepSize = (end - start) / steps;
+    let current = start;
+    for (let i = 0; i < steps; i++) {
+        current = Math.min(current + stepSize + (Math.random() * 200 - 100), end);
+        window.scrollTo(0, current);
+        await new Promise(resolve => setTimeout(resolve, 300 + Math.random() * 400));
+    }
+}
+"""
+
+
+@dataclass
+class ScrapeState:
+    """검색 진행 여부와 결과 (요청 처리 스레드와 스크래핑 스레드가 함께 사용)"""
+    lock: Lock = field(default_factory=Lock)
+    busy: Event = field(default_factory=Event)
+    results: list = field(default_factory=list)
+
+    def try_start(self):
+        """검색 중이 아니면 검색 중으로 표시하고 True 반환 (이전 검색 결과는 이때 해제)"""
+        with self.lock:
+            if self.busy.is_set():
+                return False
+            self.busy.set()
+            self.results = []
+            return True
+
+    def get_results(self):
+        """결과 목록 복사본 반환 (잠금은 복사하는 동안만 유지)"""
+        with self.lock:
+            return list(self.results)
+
+    def set_results(self, results):
+        """결과 목록 교체"""
+        with self.lock:
+            self.results = results
+
+
+state = ScrapeState()
 
 
 def load_config():
@@ -77,8 +196,9 @@ def load_config():
 
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return {**default_config, **json.load(f)}
+            with open(CONFIG_FILE, 'rb') as f:
+                data = f.read()
+            return {**default_config, **(orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data))}
         except Exception as e:
             app.logger.error(f'설정 로드 오류: {str(e)}')
             return default_config
@@ -88,22 +208,58 @@ def load_config():
 def save_config(config):
     """설정 저장"""
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(config, ensure_ascii=False, indent=2).encode('utf-8')
+        with open(CONFIG_FILE, 'wb') as f:
+            f.write(data)
         return True
     except Exception as e:
         app.logger.error(f'설정 저장 오류: {str(e)}')
         return False
 
 
+def json_response(obj, status=200):
+    """JSON 응답 (orjson 이 있으면 바로 bytes 로 직렬화)"""
+    if not ORJSON_AVAILABLE:
+        return jsonify(obj), status
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
+def results_as_dicts(rows):
+    """결과 튜플 목록을 API 응답용 dict 목록으로 변환"""
+    return [dict(zip(FIELDS, row)) for row in rows]
+
+
+# 전송 대기 중인 로그와 전송 예약 여부 (여러 스레드에서 추가, 스크래핑 루프에서 전송)
+_log_buffer = deque(maxlen=LOG_BUFFER_SIZE)
+_log_flush_pending = Event()
+
+
+def flush_logs():
+    """모아 둔 로그를 한 번에 전송 (스크래핑 루프에서 실행)"""
+    _log_flush_pending.clear()
+    logs = []
+    while _log_buffer:
+        try:
+            logs.append(_log_buffer.popleft())
+        except IndexError:
+            break
+    if logs:
+        socketio.emit('log_batch', {'logs': logs})
+
+
 def emit_log(level, message):
-    """로그 전송"""
-    log_data = {
+    """로그 전송 (LOG_FLUSH_INTERVAL 동안 모아서 전송)"""
+    _log_buffer.append({
         'level': level,
         'message': message,
         'timestamp': datetime.now().strftime('%H:%M:%S')
-    }
-    socketio.emit('log', log_data)
+    })
+    if not _log_flush_pending.is_set():
+        _log_flush_pending.set()
+        _LOOP.call_soon_threadsafe(_LOOP.call_later, LOG_FLUSH_INTERVAL, flush_logs)
 
     # 파일 로그도 기록
     if level == 'error':
@@ -115,333 +271,496 @@ def emit_log(level, message):
 
 
 async def smooth_scroll(page, start=0, end=None, steps=10):
-    """사람처럼 부드럽게 스크롤하는 함수"""
-    import random
+    """사람처럼 부드럽게 스크롤하는 함수 (애니메이션 전체를 브라우저 안에서 실행)"""
+    await page.evaluate(SMOOTH_SCROLL_JS, {'start': start, 'end': end, 'steps': steps})
+
+
+# 검색 간에 재사용하는 이벤트 루프, 브라우저, 컨텍스트 (백그라운드 스레드에서 계속 실행, uvloop 이 있으면 uvloop 사용)
+_LOOP = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_HEADLESS = None
+_CONTEXT = None
+_CONTEXT_KEY = None
+_CONTEXT_USES = 0
+
+# 컨텍스트를 새로 만드는 검색 횟수 (브라우저 지문 갱신)
+CONTEXT_ROTATE_EVERY = 10
+
+# 브라우저 실행 인자 (안티봇 우회 설정)
+CHROMIUM_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-http2',  # HTTP/2 비활성화 (프로토콜 오류 방지)
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    '--disable-extensions',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--incognito'  # 시크릿 모드
+)
+
+# 컨텍스트 기본 설정
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'ko-KR',
+    'timezone_id': 'Asia/Seoul'
+}
+
+# 사람처럼 보이기 위한 대기/스크롤 난수 (COUPANG_SCRAPE_SEED 를 지정하면 매번 같은 일정으로 재현)
+_RNG = random.Random(os.environ.get('COUPANG_SCRAPE_SEED'))
+
+# 결과가 모자랄 때 추가로 볼 검색 페이지 수와 동시에 여는 페이지 수
+MAX_SEARCH_PAGES = 5
+PAGE_CONCURRENCY = 3
+
+# 스텔스 설정 (한 번만 만들어 두고 새 컨텍스트마다 적용)
+_STEALTH = Stealth(
+    navigator_languages_override=('ko-KR', 'ko'),
+    navigator_user_agent_override=None  # 자동 설정
+) if STEALTH_AVAILABLE else None
+
+
+def _run_loop():
+    """스크래핑용 이벤트 루프 실행"""
+    asyncio.set_event_loop(_LOOP)
+    _LOOP.run_forever()
+
+
+Thread(target=_run_loop, daemon=True).start()
+
+
+async def get_browser(headless):
+    """브라우저 실행 (이미 같은 설정으로 실행 중이면 재사용)"""
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_HEADLESS
+
+    if _BROWSER is not None and _BROWSER.is_connected() and _BROWSER_HEADLESS == headless:
+        emit_log('info', '실행 중인 브라우저 재사용')
+        return _BROWSER
+
+    await close_context()
+    if _BROWSER is not None and _BROWSER.is_connected():
+        await _BROWSER.close()
+    _BROWSER = None
+
+    if _PLAYWRIGHT is None:
+        emit_log('info', 'Playwright 초기화 중...')
+        _PLAYWRIGHT = await async_playwright().start()
+
+    # 브라우저 실행 (안티봇 우회 설정)
+    try:
+        _BROWSER = await _PLAYWRIGHT.chromium.launch(headless=headless, args=list(CHROMIUM_ARGS))
+        _BROWSER_HEADLESS = headless
+        emit_log('success', '브라우저 실행 완료 (시크릿 모드, HTTP/2 비활성화)')
+    except Exception as e:
+        emit_log('error', f'브라우저 실행 실패: {str(e)}')
+        raise
 
-    if end is None:
-        end = await page.evaluate("() => document.body.scrollHeight")
+    return _BROWSER
 
-    step_size = (end - start) / steps
-    current = start
 
-    for _ in range(steps):
-        # 약간의 랜덤성을 추가하여 자연스러운 스크롤 구현
-        current += step_size + random.uniform(-100, 100)
-        current = min(current, end)
-        await page.evaluate(f"window.scrollTo(0, {current})")
-        await asyncio.sleep(random.uniform(0.3, 0.7))
+async def get_context(search_params):
+    """브라우저 컨텍스트 (같은 설정이면 재사용하고, CONTEXT_ROTATE_EVERY 번마다 새로 생성)"""
+    global _CONTEXT, _CONTEXT_KEY, _CONTEXT_USES
 
+    # 브라우저 (이미 실행 중이면 재사용, 다시 실행되면 기존 컨텍스트도 정리됨)
+    browser = await get_browser(search_params.get('headless', True))
 
-async def scrape_coupang(search_params):
-    """쿠팡 스크래핑 (개선된 버전 - 봇 감지 회피)"""
-    global scraping_results, is_scraping
-    import random
+    proxy_server = search_params.get('proxy_server') if search_params.get('use_proxy') else None
+    use_stealth = search_params.get('use_stealth', True)
+    key = (proxy_server or None, use_stealth)
 
-    results = []
-    query = search_params['query']
-    max_results = search_params.get('max_results', 20)
+    if _CONTEXT is not None and _CONTEXT_KEY == key and _CONTEXT_USES < CONTEXT_ROTATE_EVERY:
+        _CONTEXT_USES += 1
+        emit_log('info', f'브라우저 컨텍스트 재사용 ({_CONTEXT_USES}/{CONTEXT_ROTATE_EVERY})')
+        return _CONTEXT
 
-    emit_log('info', f"'{query}' 검색 시작...")
+    await close_context()
+
+    # 컨텍스트 설정
+    context_options = dict(CONTEXT_OPTIONS)
+
+    # 프록시 설정
+    if proxy_server:
+        emit_log('info', f'프록시 사용: {proxy_server}')
+        context_options['proxy'] = {'server': proxy_server}
 
     try:
-        async with async_playwright() as p:
-            emit_log('info', 'Playwright 초기화 중...')
+        context = await browser.new_context(**context_options)
+        emit_log('success', '브라우저 컨텍스트 생성 완료')
+    except Exception as e:
+        emit_log('error', f'컨텍스트 생성 실패: {str(e)}')
+        raise
 
-            # 브라우저 실행 (안티봇 우회 설정)
-            try:
-                browser = await p.chromium.launch(
-                    headless=search_params.get('headless', True),
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-dev-shm-usage',
-                        '--no-sandbox',
-                        '--disable-http2',  # HTTP/2 비활성화 (프로토콜 오류 방지)
-                        '--disable-gpu',
-                        '--window-size=1920,1080',
-                        '--disable-extensions',
-                        '--disable-setuid-sandbox',
-                        '--disable-web-security',
-                        '--disable-features=IsolateOrigins,site-per-process',
-                        '--incognito'  # 시크릿 모드
-                    ]
-                )
-                emit_log('success', '브라우저 실행 완료 (시크릿 모드, HTTP/2 비활성화)')
-            except Exception as e:
-                emit_log('error', f'브라우저 실행 실패: {str(e)}')
-                raise
-
-            # 컨텍스트 설정
-            context_options = {
-                'viewport': {'width': 1920, 'height': 1080},
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'locale': 'ko-KR',
-                'timezone_id': 'Asia/Seoul'
-            }
-
-            # 프록시 설정
-            if search_params.get('use_proxy') and search_params.get('proxy_server'):
-                proxy_server = search_params.get('proxy_server')
-                emit_log('info', f'프록시 사용: {proxy_server}')
-                context_options['proxy'] = {'server': proxy_server}
+    try:
+        # 이미지/폰트/미디어 및 광고 요청 차단 (CSS 는 요소 표시 대기에 필요하므로 유지)
+        await context.route('**/*', block_resources)
+
+        # 스텔스 모드 적용 (봇 감지 우회) - context에 적용
+        if use_stealth and STEALTH_AVAILABLE:
+            await _STEALTH.apply_stealth_async(context)
+            emit_log('success', '스텔스 모드 활성화 완료')
+        elif use_stealth and not STEALTH_AVAILABLE:
+            emit_log('warning', 'playwright-stealth 미설치 (기본 모드)')
+        else:
+            emit_log('info', '스텔스 모드 비활성화 (사용자 설정)')
+    except Exception:
+        await context.close()
+        raise
 
-            try:
-                context = await browser.new_context(**context_options)
-                emit_log('success', '브라우저 컨텍스트 생성 완료')
-            except Exception as e:
-                emit_log('error', f'컨텍스트 생성 실패: {str(e)}')
-                await browser.close()
-                raise
-
-            # 스텔스 모드 적용 (봇 감지 우회) - context에 적용
-            if search_params.get('use_stealth', True) and STEALTH_AVAILABLE:
-                stealth_config = Stealth(
-                    navigator_languages_override=('ko-KR', 'ko'),
-                    navigator_user_agent_override=None  # 자동 설정
-                )
-                await stealth_config.apply_stealth_async(context)
-                emit_log('success', '스텔스 모드 활성화 완료')
-            elif search_params.get('use_stealth', True) and not STEALTH_AVAILABLE:
-                emit_log('warning', 'playwright-stealth 미설치 (기본 모드)')
-            else:
-                emit_log('info', '스텔스 모드 비활성화 (사용자 설정)')
+    _CONTEXT = context
+    _CONTEXT_KEY = key
+    _CONTEXT_USES = 1
+    return _CONTEXT
 
-            page = await context.new_page()
 
-            try:
-                # 검색 URL 구성
-                import urllib.parse
-                encoded_query = urllib.parse.quote(query)
-                search_url = f"https://www.coupang.com/np/search?component=&q={encoded_query}&channel=user"
-
-                emit_log('info', f'검색 페이지 접속 중: {query}')
-
-                # 쿠키 삭제
-                await context.clear_cookies()
-
-                # 사람처럼 랜덤한 대기 시간 추가
-                await asyncio.sleep(random.uniform(2, 4))
-
-                # 여러 번 시도 (재시도 로직)
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        await page.goto(
-                            search_url,
-                            wait_until='domcontentloaded',
-                            timeout=60000
-                        )
-                        emit_log('success', '검색 페이지 접속 완료')
-                        break
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            emit_log('warning', f'접속 실패 (시도 {attempt + 1}/{max_retries}), 재시도 중...')
-                            await asyncio.sleep(3)
-                        else:
-                            emit_log('error', f'최대 재시도 횟수 초과: {str(e)}')
-                            raise
+async def close_context():
+    """재사용 중인 컨텍스트 종료"""
+    global _CONTEXT, _CONTEXT_KEY
+
+    if _CONTEXT is not None:
+        try:
+            await _CONTEXT.close()
+        except Exception:
+            pass
+        _CONTEXT = None
+        _CONTEXT_KEY = None
 
-                # 페이지 로드 후 자연스러운 대기
-                await asyncio.sleep(random.uniform(3, 5))
 
-                # 페이지 로드 상태 확인
-                page_state = await page.evaluate('document.readyState')
-                emit_log('info', f'페이지 로드 상태: {page_state}')
+async def close_browser():
+    """브라우저와 Playwright 종료"""
+    global _PLAYWRIGHT, _BROWSER
 
-                # 봇 탐지 확인
-                page_content = await page.content()
-                if "보안 검사 중입니다" in page_content or "캡차" in page_content:
-                    emit_log('warning', '봇 탐지 감지됨. 잠시 대기 후 재시도...')
-                    await asyncio.sleep(random.uniform(15, 30))
+    await close_context()
+    if _BROWSER is not None:
+        await _BROWSER.close()
+        _BROWSER = None
+    if _PLAYWRIGHT is not None:
+        await _PLAYWRIGHT.stop()
+        _PLAYWRIGHT = None
 
-                # 자연스러운 스크롤 동작
-                viewport_height = await page.evaluate("window.innerHeight")
-                total_height = await page.evaluate("document.body.scrollHeight")
 
-                emit_log('info', '자연스러운 스크롤 시작...')
+@atexit.register
+def shutdown_browser():
+    """프로세스 종료 시 브라우저 정리"""
+    try:
+        asyncio.run_coroutine_threadsafe(close_browser(), _LOOP).result(timeout=10)
+    except Exception:
+        pass
+
+
+async def fetch_search_page(context, search_url, page_no):
+    """검색 결과의 다른 페이지를 새 탭에서 열어 제품 카드 추출"""
+    page = await context.new_page()
+    try:
+        await page.goto(f'{search_url}&page={page_no}', wait_until='domcontentloaded', timeout=30000)
+        await page.wait_for_selector('li.search-product', timeout=15000)
+        return await page.evaluate(PRODUCTS_JS)
+    finally:
+        await page.close()
+
+
+async def scrape_coupang(search_params):
+    """쿠팡 스크래핑 (개선된 버전 - 봇 감지 회피)
+
+    (결과 목록, 정상 완료 여부) 반환. 봇 탐지나 목록 로드 실패, 페이지 수집 실패가
+    있었던 검색은 정상 완료가 아니므로 캐시하지 않음.
+    """
+    results = []
+    complete = True
+    query = search_params['query']
+    max_results = search_params.get('max_results', 20)
 
-                # 중간 중간 멈추면서 스크롤
-                current_position = 0
-                while current_position < total_height:
-                    # 다음 스크롤 위치 계산 (랜덤성 추가)
-                    scroll_amount = random.randint(300, 700)
-                    next_position = min(current_position + scroll_amount, total_height)
+    emit_log('info', f"'{query}' 검색 시작...")
 
-                    # 부드럽게 스크롤
-                    await smooth_scroll(page, current_position, next_position)
+    try:
+        # 컨텍스트 (브라우저와 함께 재사용, 검색마다 페이지만 새로 생성)
+        context = await get_context(search_params)
+        page = await context.new_page()
 
-                    # 스크롤 후 잠시 대기 (컨텐츠 로딩 대기)
-                    await asyncio.sleep(random.uniform(0.5, 1.5))
+        try:
 
-                    # 가끔 위로 살짝 스크롤 (사람처럼 보이게)
-                    if random.random() < 0.2:  # 20% 확률
-                        back_scroll = random.randint(100, 300)
-                        await page.evaluate(f"window.scrollBy(0, -{back_scroll})")
-                        await asyncio.sleep(random.uniform(0.3, 0.7))
+            # 검색 URL 구성
+            encoded_query = quote(query)
+            search_url = f"https://www.coupang.com/np/search?component=&q={encoded_query}&channel=user"
 
-                    current_position = next_position
+            emit_log('info', f'검색 페이지 접속 중: {query}')
 
-                emit_log('success', '스크롤 완료')
+            # 쿠키 삭제
+            await context.clear_cookies()
 
-                # 요소 찾기 전 자연스러운 대기
-                await asyncio.sleep(random.uniform(1, 2))
+            # 사람처럼 랜덤한 대기 시간 추가
+            await asyncio.sleep(_RNG.uniform(2, 4))
 
-                # 제품 목록 대기
-                emit_log('info', '제품 목록 로드 대기 중...')
+            # 여러 번 시도 (재시도 로직)
+            max_retries = 3
+            for attempt in range(max_retries):
                 try:
-                    await page.wait_for_selector('li.search-product', timeout=30000)
-                except:
-                    emit_log('warning', '상품 목록을 찾을 수 없습니다.')
-                    await browser.close()
-                    return results
+                    await page.goto(
+                        search_url,
+                        wait_until='domcontentloaded',
+                        timeout=30000
+                    )
+                    emit_log('success', '검색 페이지 접속 완료')
+                    break
+                except Exception as e:
+                    if attempt < max_retries - 1:
+                        emit_log('warning', f'접속 실패 (시도 {attempt + 1}/{max_retries}), 재시도 중...')
+                        await asyncio.sleep(3)
+                    else:
+                        emit_log('error', f'최대 재시도 횟수 초과: {str(e)}')
+                        raise
+
+            # 봇 탐지 확인 (페이지 전체 HTML을 가져오지 않고 브라우저 안에서 확인)
+            is_blocked = await page.evaluate(
+                "() => document.body.innerText.includes('보안 검사 중입니다') || document.body.innerText.includes('캡차')"
+            )
+            if is_blocked:
+                complete = False
+                emit_log('warning', '봇 탐지 감지됨. 잠시 대기 후 재시도...')
+                await asyncio.sleep(_RNG.uniform(15, 30))
+
+            # 제품 목록 대기 (고정 대기 대신 목록이 보이는 시점을 준비 완료로 판단)
+            emit_log('info', '제품 목록 로드 대기 중...')
+            try:
+                await page.wait_for_selector('li.search-product', timeout=15000)
+            except:
+                emit_log('warning', '상품 목록을 찾을 수 없습니다.')
+                return results, False
+
+            # 목록이 보인 뒤 자연스러운 대기
+            await asyncio.sleep(_RNG.uniform(0.5, 1.5))
+
+            # 자연스러운 스크롤 동작
+            viewport_height = await page.evaluate("window.innerHeight")
+            total_height = await page.evaluate("document.body.scrollHeight")
+
+            emit_log('info', '자연스러운 스크롤 시작...')
+
+            # 중간 중간 멈추면서 스크롤
+            current_position = 0
+            while current_position < total_height:
+                # 다음 스크롤 위치 계산 (랜덤성 추가)
+                scroll_amount = _RNG.randint(300, 700)
+                next_position = min(current_position + scroll_amount, total_height)
+
+                # 부드럽게 스크롤
+                await smooth_scroll(page, current_position, next_position)
+
+                # 스크롤 후 잠시 대기 (컨텐츠 로딩 대기)
+                await asyncio.sleep(_RNG.uniform(0.5, 1.5))
+
+                # 가끔 위로 살짝 스크롤 (사람처럼 보이게)
+                if _RNG.random() < 0.2:  # 20% 확률
+                    back_scroll = _RNG.randint(100, 300)
+                    await page.evaluate(f"window.scrollBy(0, -{back_scroll})")
+                    await asyncio.sleep(_RNG.uniform(0.3, 0.7))
+
+                current_position = next_position
+
+            emit_log('success', '스크롤 완료')
+
+            # 제품 수집
+            emit_log('info', '제품 정보 수집 중...')
+            products = await page.evaluate(PRODUCTS_JS)
+            emit_log('info', f'{len(products)}개 제품 발견')
+
+            if not products:
+                emit_log('warning', '검색 결과가 없습니다')
+                return results, complete
+
+            # 필터 조건 (반복문 밖에서 한 번만 읽음)
+            min_price = search_params.get('min_price', 0)
+            max_price = search_params.get('max_price', 999999999)
+            exclude_rocket = search_params.get('exclude_rocket', True)
+            exclude_rocket_direct = search_params.get('exclude_rocket_direct', True)
+
+            # 제품 처리 (광고 제외)
+            non_ad_rank = 0
+            ad_count = 0
+
+            # 아직 전송하지 않은 실시간 결과
+            pending = []
+            last_emit = time.monotonic()
+
+            page_no = 1
+            while True:
+                # PRODUCTS_JS 가 모든 필드를 기본값과 함께 돌려주므로 예외 처리 없이 조건 분기만 사용
+                for product in products:
+                    # 광고 상품 체크
+                    if product['isAd']:
+                        ad_count += 1
+                        emit_log('info', f'광고 상품 발견: {ad_count}번째 광고')
+                        continue
 
-                # 제품 수집
-                emit_log('info', '제품 정보 수집 중...')
-                products = await page.query_selector_all('li.search-product')
-                emit_log('info', f'{len(products)}개 제품 발견')
+                    non_ad_rank += 1
 
-                if not products:
-                    emit_log('warning', '검색 결과가 없습니다')
-                    await browser.close()
-                    return results
-
-                # 제품 처리 (광고 제외)
-                non_ad_rank = 0
-                ad_count = 0
-
-                for idx, product in enumerate(products):
-                    try:
-                        # 광고 상품 체크
-                        class_attr = await product.get_attribute('class')
-                        is_ad = 'search-product__ad' in (class_attr or '')
-
-                        if is_ad:
-                            ad_count += 1
-                            emit_log('info', f'광고 상품 발견: {ad_count}번째 광고')
-                            continue
-
-                        non_ad_rank += 1
-
-                        # 제품 정보 추출
-                        name_elem = await product.query_selector('.name')
-                        name = await name_elem.inner_text() if name_elem else "제목 없음"
-
-                        price_elem = await product.query_selector('.price-value')
-                        price_text = await price_elem.inner_text() if price_elem else "0"
-                        price = int(price_text.replace(',', '').replace('원', '').strip())
-
-                        # 가격 필터링
-                        min_price = search_params.get('min_price', 0)
-                        max_price = search_params.get('max_price', 999999999)
-                        if price < min_price or price > max_price:
-                            continue
-
-                        # 필터링
-                        is_rocket = await product.query_selector('.badge.rocket') is not None
-                        is_rocket_direct = await product.query_selector('.badge.rocket-direct') is not None
-                        is_rocket_global = await product.query_selector('.badge.rocket-global') is not None
-                        is_rocket_fresh = await product.query_selector('.badge.rocket-fresh') is not None
-
-                        if search_params.get('exclude_rocket', True) and is_rocket:
-                            continue
-                        if search_params.get('exclude_rocket_direct', True) and (is_rocket_direct or is_rocket_global or is_rocket_fresh):
-                            continue
-
-                        # URL
-                        link_elem = await product.query_selector('a.search-product-link')
-                        product_url = ""
-                        if link_elem:
-                            href = await link_elem.get_attribute('href')
-                            if href:
-                                product_url = f"https://www.coupang.com{href}" if href.startswith('/') else href
-
-                        # 평점
-                        rating_elem = await product.query_selector('.rating')
-                        rating = await rating_elem.inner_text() if rating_elem else "N/A"
-
-                        # 리뷰 수
-                        review_elem = await product.query_selector('.rating-total-count')
-                        review_count = await review_elem.inner_text() if review_elem else "0"
-
-                        # 판매자 정보
-                        seller_type = "일반 판매자"
-                        if is_rocket:
-                            seller_type = "로켓배송"
-                        elif is_rocket_direct:
-                            seller_type = "로켓직구"
-                        elif is_rocket_global:
-                            seller_type = "로켓글로벌"
-                        elif is_rocket_fresh:
-                            seller_type = "로켓프레시"
-
-                        results.append({
-                            'rank': non_ad_rank,  # 광고 제외 순위
-                            'name': name.strip(),
-                            'price': price,
-                            'seller_type': seller_type,
-                            'rating': rating.strip(),
-                            'review_count': review_count.strip(),
-                            'url': product_url
-                        })
-
-                        emit_log('info', f'처리 중... {len(results)}개 제품 발견 (광고 제외 순위: {non_ad_rank})')
-
-                        # 실시간 결과 전송
-                        socketio.emit('result_update', {
-                            'count': len(results),
-                            'latest': results[-1]
-                        })
-
-                        if len(results) >= max_results:
-                            break
-
-                    except Exception as e:
-                        emit_log('warning', f'제품 처리 중 오류: {str(e)}')
+                    # 제품 정보 추출
+                    name = product['name'] or "제목 없음"
+
+                    price_match = _PRICE_RE.search(product['price'])
+                    if not price_match:
+                        continue
+                    price = int(price_match.group().replace(',', ''))
+
+                    # 가격 필터링
+                    if price < min_price or price > max_price:
                         continue
 
-                # 가격 순 정렬
-                results.sort(key=lambda x: x['price'])
-                emit_log('success', f'검색 완료! 총 {len(results)}개 제품 수집 (광고 {ad_count}개 제외)')
+                    # 필터링
+                    is_rocket = product['rocket']
+                    is_rocket_direct = product['rocketDirect']
+                    is_rocket_global = product['rocketGlobal']
+                    is_rocket_fresh = product['rocketFresh']
 
-            except Exception as e:
-                emit_log('error', f'페이지 처리 중 오류: {str(e)}\n{traceback.format_exc()}')
-                raise
-            finally:
-                await browser.close()
-                emit_log('info', '브라우저 종료')
+                    if exclude_rocket and is_rocket:
+                        continue
+                    if exclude_rocket_direct and (is_rocket_direct or is_rocket_global or is_rocket_fresh):
+                        continue
+
+                    # URL
+                    href = product['href']
+                    product_url = ""
+                    if href:
+                        product_url = f"https://www.coupang.com{href}" if href.startswith('/') else href
+
+                    # 평점
+                    rating = product['rating']
+
+                    # 리뷰 수
+                    review_count = product['reviewCount']
+
+                    # 판매자 정보
+                    seller_type = "일반 판매자"
+                    if is_rocket:
+                        seller_type = "로켓배송"
+                    elif is_rocket_direct:
+                        seller_type = "로켓직구"
+                    elif is_rocket_global:
+                        seller_type = "로켓글로벌"
+                    elif is_rocket_fresh:
+                        seller_type = "로켓프레시"
+
+                    # FIELDS 순서 (rank 는 광고 제외 순위, 문자열은 PRODUCTS_JS 에서 이미 trim)
+                    results.append((non_ad_rank, name, price, seller_type,
+                                    rating, review_count, product_url))
+
+                    emit_log('info', f'처리 중... {len(results)}개 제품 발견 (광고 제외 순위: {non_ad_rank})')
+
+                    # 실시간 결과 전송 (몇 개씩 모아서 전송)
+                    pending.append(dict(zip(FIELDS, results[-1])))
+                    if len(pending) >= RESULT_EMIT_BATCH or time.monotonic() - last_emit > RESULT_EMIT_INTERVAL:
+                        socketio.emit('result_update', {'count': len(results), 'batch': pending})
+                        pending = []
+                        last_emit = time.monotonic()
+
+                    if len(results) >= max_results:
+                        break
+
+                # 결과가 모자라면 다음 페이지들을 동시에 불러와 이어서 처리
+                if len(results) >= max_results or page_no >= MAX_SEARCH_PAGES:
+                    break
+                next_pages = range(page_no + 1, min(page_no + PAGE_CONCURRENCY, MAX_SEARCH_PAGES) + 1)
+                emit_log('info', f'결과 부족, {next_pages[0]}~{next_pages[-1]} 페이지 동시 수집 중...')
+                chunks = await asyncio.gather(
+                    *(fetch_search_page(context, search_url, n) for n in next_pages),
+                    return_exceptions=True
+                )
+                products = []
+                page_no = next_pages[-1]
+                for n, chunk in zip(next_pages, chunks):
+                    if isinstance(chunk, Exception):
+                        emit_log('warning', f'{n} 페이지 수집 실패: {str(chunk)}')
+                        # 순위가 어긋나지 않도록 실패한 페이지부터는 더 수집하지 않음
+                        page_no = MAX_SEARCH_PAGES
+                        complete = False
+                        break
+                    products.extend(chunk)
+                if not products:
+                    break
+
+            # 남은 결과 전송
+            if pending:
+                socketio.emit('result_update', {'count': len(results), 'batch': pending})
+
+            # 가격 순 정렬
+            results.sort(key=_PRICE_KEY)
+            emit_log('success', f'검색 완료! 총 {len(results)}개 제품 수집 (광고 {ad_count}개 제외)')
+
+        except Exception as e:
+            emit_log('error', f'페이지 처리 중 오류: {str(e)}\n{traceback.format_exc()}')
+            raise
+        finally:
+            # 브라우저와 컨텍스트는 다음 검색을 위해 남겨 두고 페이지만 종료
+            await page.close()
+            emit_log('info', '검색 페이지 종료')
 
     except Exception as e:
         emit_log('error', f'스크래핑 오류: {str(e)}\n{traceback.format_exc()}')
         raise
 
-    return results
+    return results, complete
+
+
+# 검색 조건별 최근 결과 {키: (만료 시각, 결과)} (스크래핑 루프에서만 사용)
+_result_cache = OrderedDict()
+
+
+def get_cached_results(key):
+    """만료되지 않은 캐시 결과 반환 (없으면 None)"""
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return entry[1]
 
 
-def run_scraper(search_params):
-    """스크래퍼 실행 (별도 스레드)"""
-    global scraping_results, is_scraping
+def cache_results(key, results):
+    """검색 결과 캐시에 저장 (가장 오래 사용하지 않은 것부터 제거)"""
+    _result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL, results)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
 
+
+async def run_scraper(search_params):
+    """스크래퍼 실행 (공유 이벤트 루프의 작업, api_search 에서 state.busy 를 설정한 뒤 제출)"""
     try:
-        is_scraping = True
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        scraping_results = loop.run_until_complete(scrape_coupang(search_params))
-        loop.close()
+        # 같은 조건으로 최근에 검색했다면 브라우저를 쓰지 않고 그 결과를 사용
+        cache_key = json.dumps(search_params, sort_keys=True, ensure_ascii=False)
+        results = get_cached_results(cache_key)
+        if results is None:
+            results, complete = await scrape_coupang(search_params)
+            # 차단되거나 일부만 수집한 결과는 바로 다시 검색할 수 있도록 캐시하지 않음
+            if complete and results:
+                cache_results(cache_key, results)
+        else:
+            emit_log('info', f'최근 검색 결과 재사용 ({len(results)}개)')
+        state.set_results(results)
+        flush_logs()
 
         # 완료 알림
         socketio.emit('scraping_complete', {
             'success': True,
-            'count': len(scraping_results),
-            'results': scraping_results
+            'count': len(results),
+            'results': results_as_dicts(results)
         })
 
     except Exception as e:
+        flush_logs()
         socketio.emit('scraping_complete', {
             'success': False,
             'error': str(e),
             'traceback': traceback.format_exc()
         })
     finally:
-        is_scraping = False
+        state.busy.clear()
 
 
 @app.route('/')
@@ -455,71 +774,101 @@ def index():
 def api_config():
     """설정 API"""
     if request.method == 'GET':
-        return jsonify(load_config())
+        return json_response(load_config())
     else:
         config = request.json
         if save_config(config):
-            return jsonify({'success': True})
+            return json_response({'success': True})
         else:
-            return jsonify({'success': False, 'error': '설정 저장 실패'}), 500
+            return json_response({'success': False, 'error': '설정 저장 실패'}, 500)
 
 
 @app.route('/api/search', methods=['POST'])
 def api_search():
     """검색 API"""
-    global is_scraping
-
-    if is_scraping:
-        return jsonify({'success': False, 'error': '이미 검색 중입니다'}), 400
-
     if not PLAYWRIGHT_AVAILABLE:
-        return jsonify({'success': False, 'error': 'Playwright가 설치되지 않았습니다'}), 500
+        return json_response({'success': False, 'error': 'Playwright가 설치되지 않았습니다'}, 500)
+
+    # 검색 중 표시 전에 요청 본문부터 확인 (잘못된 요청으로 검색 중 상태가 남지 않도록)
+    search_params = request.get_json(silent=True)
+    if not isinstance(search_params, dict):
+        return json_response({'success': False, 'error': '잘못된 요청입니다'}, 400)
 
-    search_params = request.json
+    # 검색 중 여부 확인과 표시를 한 번에 처리 (동시 요청 방지)
+    if not state.try_start():
+        return json_response({'success': False, 'error': '이미 검색 중입니다'}, 400)
 
-    # 백그라운드 스레드에서 실행
-    thread = Thread(target=run_scraper, args=(search_params,))
-    thread.daemon = True
-    thread.start()
+    # 스크래핑용 이벤트 루프에 작업으로 제출 (요청마다 스레드를 만들지 않음)
+    try:
+        asyncio.run_coroutine_threadsafe(run_scraper(search_params), _LOOP)
+    except Exception as e:
+        state.busy.clear()
+        app.logger.error(f'검색 시작 오류: {str(e)}')
+        return json_response({'success': False, 'error': '검색을 시작하지 못했습니다'}, 500)
 
-    return jsonify({'success': True, 'message': '검색 시작'})
+    return json_response({'success': True, 'message': '검색 시작'})
 
 
 @app.route('/api/results', methods=['GET'])
 def api_results():
     """결과 API"""
-    return jsonify(scraping_results)
+    return json_response(results_as_dicts(state.get_results()))
 
 
 @app.route('/api/export', methods=['POST'])
 def api_export():
     """CSV 내보내기"""
-    if not scraping_results:
-        return jsonify({'success': False, 'error': '결과가 없습니다'}), 400
+    results = state.get_results()
+    if not results:
+        return json_response({'success': False, 'error': '결과가 없습니다'}, 400)
 
-    try:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'coupang_results_{timestamp}.csv'
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'coupang_results_{timestamp}.csv'
 
-        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['name', 'price', 'seller_type', 'rating', 'review_count', 'url'])
-            writer.writeheader()
-            writer.writerows(scraping_results)
+    def generate():
+        """한 줄씩 CSV로 만들어 바로 전송 (파일을 만들지 않음)"""
+        buf = io.StringIO()
+        writer = csv.writer(buf)
 
-        return send_file(filename, as_attachment=True)
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        # 엑셀에서 한글이 깨지지 않도록 BOM 먼저 전송
+        buf.write('\ufeff')
+        writer.writerow(FIELDS)
+
+        for row in results:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            writer.writerow(row)
+
+        yield buf.getvalue()
+
+    return Response(generate(), mimetype='text/csv', headers={
+        'Content-Disposition': f'attachment; filename={filename}',
+        'X-Accel-Buffering': 'no'
+    })
 
 
 @app.route('/api/logs', methods=['GET'])
 def api_logs():
     """로그 조회"""
     try:
-        with open('logs/coupang_crawler.log', 'r', encoding='utf-8') as f:
-            logs = f.readlines()[-100:]  # 최근 100줄
-        return jsonify({'success': True, 'logs': logs})
+        # 파일 전체가 아니라 끝부분만 읽어서 최근 줄만 반환
+        with open('logs/coupang_crawler.log', 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            chunk = LOG_TAIL_BYTES
+            while True:
+                f.seek(max(0, size - chunk))
+                logs = f.read().decode('utf-8', 'replace').splitlines(keepends=True)
+                if size > chunk:
+                    logs = logs[1:]  # 중간에서 잘린 첫 줄 제외
+                # 줄이 모자라면 (긴 트레이스백 등) 읽는 범위를 두 배로 늘려 다시 읽음
+                if len(logs) >= LOG_TAIL_LINES or size <= chunk:
+                    break
+                chunk *= 2
+        logs = logs[-LOG_TAIL_LINES:]
+        return json_response({'success': True, 'logs': logs})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 
 @socketio.on('connect')
@@ -543,4 +892,4 @@ if __name__ == '__main__':
     print('=' * 60)
     print('\n브라우저에서 http://localhost:5000 을 열어주세요\n')
 
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True, allow_unsafe_werkzeug=True)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=DEBUG, allow_unsafe_werkzeug=True)
@@ -1,14 +1,23 @@
 from gevent import monkey
 monkey.patch_all()
 
+import gevent
+from gevent.pool import Pool
+from gevent.lock import BoundedSemaphore
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-import time
+import soupsieve
+import re
 import random
 import urllib.parse
 import pandas as pd
@@ -16,6 +25,7 @@ from datetime import datetime
 from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 import sys
+import collections
 sys.setrecursionlimit(10000)
 import os
 import json
@@ -23,6 +33,30 @@ import numpy as np
 from apscheduler.schedulers.background import BackgroundScheduler
 from gevent.pywsgi import WSGIServer
 from geventwebsocket.handler import WebSocketHandler
+from socketio_json import socketio_json_module
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTML 파서 (lxml이 있으면 C로 구현된 lxml 사용)
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# 상품 분석용 선택자 (한 번만 컴파일)
+SEL_PRODUCT = soupsieve.compile('.search-product')
+SEL_PRODUCT_LINK = soupsieve.compile('a.search-product-link')
+SEL_PRODUCT_NAME = soupsieve.compile('.name')
+AD_CLASS = 'search-product__ad'
+# 상품 링크에서 상품 ID 추출 (/vp/products/123?itemId=... -> 123)
+PRODUCT_ID_RE = re.compile(r'/([^/?]+)(?:\?|$)')
 
 # Flask 앱과 SocketIO 초기화
 app = Flask(__name__)
@@ -31,20 +65,78 @@ socketio = SocketIO(app,
                    async_mode='gevent', 
                    cors_allowed_origins="*",
                    ping_timeout=60,
-                   ping_interval=25)
+                   ping_interval=25,
+                   # 데이터프레임에서 꺼낸 numpy 값도 그대로 직렬화
+                   json=socketio_json_module(orjson.OPT_SERIALIZE_NUMPY if ORJSON_AVAILABLE else None))
+
+# 검색 페이지 주소와 최대 검색 페이지 수
+SEARCH_URL = 'https://www.coupang.com/np/search?component=&q={query}&channel=user&page={page}'
+MAX_PAGES = 27
+# 한 번에 동시에 요청할 페이지 수
+PAGE_FETCH_CONCURRENCY = 4
+# 크롬으로 한 페이지를 다시 시도하는 최대 횟수
+PAGE_RETRIES = 3
+# 가져오지 못한 페이지가 있어 순위를 확정할 수 없는 검색 결과 (기존 결과를 덮어쓰지 않음)
+SEARCH_INCOMPLETE = object()
+# 봇 탐지 페이지 문구
+BOT_CHECK_MARKERS = ("보안 검사 중입니다", "캡차")
+# 동시에 검색할 키워드 수 (환경 변수로 조절)
+KEYWORD_CONCURRENCY = int(os.environ.get('RANK_SEARCH_CONCURRENCY', '8'))
+# 검색 대상과 결과를 저장하는 엑셀 파일
+RANK_FILE = 'coupang_rank.xlsx'
+# 엑셀 파일 중간 저장 간격 (검색 결과 행 수 기준, 마지막에는 항상 저장)
+EXCEL_SAVE_EVERY = 50
+# 검색 결과를 기록하는 열
+RESULT_COLUMNS = ['page', 'rank', 'ad', 'page_rank', 'date', 'time']
+
+# 검색 페이지 요청용 HTTP 세션 (연결 재사용)
+http_session = requests.Session()
+http_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
+})
+# 동시에 요청하는 페이지 수만큼 연결을 유지하고, 일시적인 오류는 짧게 재시도
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=KEYWORD_CONCURRENCY * PAGE_FETCH_CONCURRENCY,
+    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+))
 
 # 전역 변수 설정
 search_active = False
-log_messages = []
+log_messages = collections.deque(maxlen=1000)  # 최근 로그만 보관
 scheduler = BackgroundScheduler()
 
+# 소켓 전송 대기 중인 로그 (LOG_FLUSH_INTERVAL마다 한 번에 전송)
+LOG_FLUSH_INTERVAL = 0.1
+_pending_logs = []
+_log_flush_scheduled = False
+
+def flush_logs():
+    """쌓인 로그를 하나의 메시지로 묶어 전송"""
+    global _log_flush_scheduled
+    _log_flush_scheduled = False
+    if not _pending_logs:
+        return
+    batch = '\n'.join(_pending_logs)
+    _pending_logs.clear()
+    try:
+        socketio.emit('log_message', {'message': batch})
+    except Exception as e:
+        print(f"로그 전송 중 오류: {str(e)}")
+
 def emit_log(message):
     """로그 메시지 전송"""
+    global _log_flush_scheduled
     try:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         log_message = f"[{timestamp}] {message}"
         log_messages.append(log_message)
-        socketio.emit('log_message', {'message': log_message})
+        _pending_logs.append(log_message)
+        if not _log_flush_scheduled:
+            _log_flush_scheduled = True
+            gevent.spawn_later(LOG_FLUSH_INTERVAL, flush_logs)
         print(log_message)
     except Exception as e:
         print(f"로그 전송 중 오류: {str(e)}")
@@ -54,10 +146,10 @@ def handle_connect():
     """클라이언트 연결 시 처리"""
     try:
         emit_log("클라이언트 연결됨")
-        # 최근 로그 전송
-        recent_logs = log_messages[-100:] if log_messages else []
-        for log in recent_logs:
-            socketio.emit('log_message', {'message': log})
+        # 최근 로그를 접속한 클라이언트에게만 한 번에 전송
+        recent_logs = list(log_messages)[-100:]
+        if recent_logs:
+            emit('log_message', {'message': '\n'.join(recent_logs)})
     except Exception as e:
         print(f"연결 처리 중 오류: {str(e)}")
 
@@ -68,6 +160,23 @@ def handle_disconnect():
     if search_active:
         emit_log("검색은 백그라운드에서 계속 진행됩니다.")
 
+# 설치된 크롬 드라이버 경로 (처음 한 번만 설치/확인)
+_chromedriver_path = None
+
+def get_chromedriver_path():
+    """크롬 드라이버 경로 반환 (처음 호출할 때 로깅 설정과 자동 설치 수행)"""
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        # 로깅 설정
+        import logging
+        logging.basicConfig(level=logging.DEBUG)
+        logger = logging.getLogger('selenium.webdriver.remote.remote_connection')
+        logger.setLevel(logging.DEBUG)
+        
+        # WebDriver Manager를 사용하여 크롬 드라이버 자동 설치
+        _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
 def setup_chrome_driver():
     """크롬 드라이버 설정"""
     try:
@@ -84,19 +193,9 @@ def setup_chrome_driver():
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
-        # 로깅 설정
-        import logging
-        logging.basicConfig(level=logging.DEBUG)
-        logger = logging.getLogger('selenium.webdriver.remote.remote_connection')
-        logger.setLevel(logging.DEBUG)
-        
-        # WebDriver Manager를 사용하여 크롬 드라이버 자동 설치
-        from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
-        
         # 상세 로그 설정
         service = Service(
-            ChromeDriverManager().install(),
+            get_chromedriver_path(),
             log_path='chromedriver.log',
             service_args=['--verbose']
         )
@@ -118,39 +217,14 @@ def setup_chrome_driver():
         emit_log(f"상세 오류: {traceback.format_exc()}")
         return None
 
-def smooth_scroll(driver, start=0, end=None, steps=10):
-    """사람처럼 부드럽게 스크롤하는 함수"""
-    if end is None:
-        end = driver.execute_script("return document.body.scrollHeight")
-    
-    step_size = (end - start) / steps
-    current = start
-    
-    for _ in range(steps):
-        # 약간의 랜덤성을 추가하여 자연스러운 스크롤 구현
-        current += step_size + random.uniform(-100, 100)
-        current = min(current, end)
-        driver.execute_script(f"window.scrollTo(0, {current});")
-        time.sleep(random.uniform(0.3, 0.7))  # 랜덤한 시간 간격으로 스크롤
-
-def human_like_click(driver, element):
-    """사람처럼 자연스럽게 클릭하는 함수"""
-    # 요소가 화면에 보이도록 스크롤
-    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-    time.sleep(random.uniform(0.5, 1.5))
-    
-    # 랜덤한 지연 시간 추가
-    time.sleep(random.uniform(0.1, 0.3))
-    element.click()
-
 def analyze_page(soup, page, product_id):
     """페이지 내용을 분석하여 상품 찾기"""
-    products = soup.select('.search-product')
+    products = SEL_PRODUCT.select(soup)
     non_ad_rank = 0
     ad_count = 0
     
     for product in products:
-        is_ad = 'search-product__ad' in product.get('class', [])
+        is_ad = AD_CLASS in product.get('class', ())
         
         if is_ad:
             ad_count += 1
@@ -159,146 +233,162 @@ def analyze_page(soup, page, product_id):
         
         non_ad_rank += 1
         
-        product_link = product.select_one('a.search-product-link')
+        product_link = SEL_PRODUCT_LINK.select_one(product)
         if not product_link:
             continue
         
-        current_name = product.select_one('.name')
+        # 상품 ID를 먼저 비교하고, 일치할 때만 상품명 추출
+        current_url = product_link.get('href', '')
+        match = PRODUCT_ID_RE.search(current_url)
+        current_id = match.group(1) if match else ''
+        if product_id != current_id:
+            continue
+        
+        current_name = SEL_PRODUCT_NAME.select_one(product)
         if not current_name:
             continue
         
         current_name = current_name.text.strip()
-        current_url = product_link.get('href', '')
-        current_id = current_url.split('/')[-1].split('?')[0]
         
-        if product_id == current_id:
-            emit_log(f"\n[상품 발견!] 페이지: {page}, 순위: {non_ad_rank} (광고 제외), 상품명: {current_name}, 상품 ID: {current_id}")
-            return {
-                'page': page,
-                'rank': non_ad_rank,
-                'ad_count': ad_count,
-                'name': current_name,
-                'id': current_id,
-                'url': f"https://www.coupang.com{current_url}"
-            }
+        emit_log(f"\n[상품 발견!] 페이지: {page}, 순위: {non_ad_rank} (광고 제외), 상품명: {current_name}, 상품 ID: {current_id}")
+        return {
+            'page': page,
+            'rank': non_ad_rank,
+            'ad_count': ad_count,
+            'name': current_name,
+            'id': current_id,
+            'url': f"https://www.coupang.com{current_url}"
+        }
     
     return None
 
-def search_product(driver, keyword, product_id):
-    """쿠팡에서 상품을 검색하고 순위를 찾는 함수"""
+def is_bot_check_page(html):
+    """봇 탐지(보안 검사) 페이지인지 확인"""
+    return any(marker in html for marker in BOT_CHECK_MARKERS)
+
+def fetch_page(url):
+    """HTTP로 검색 페이지 HTML 가져오기 (gevent로 패치된 소켓이라 다른 작업을 막지 않음)"""
+    response = http_session.get(url, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+def fetch_page_with_driver(driver, url):
+    """크롬으로 검색 페이지 HTML 가져오기 (HTTP 요청이 막혔을 때만 사용)"""
+    emit_log(f"크롬으로 재시도: {url}")
+    driver.delete_all_cookies()
+    
+    # 사람처럼 랜덤한 대기 시간 추가
+    gevent.sleep(random.uniform(2, 4))
+    
+    driver.get(url)
+    
+    # 상품 목록이 나타날 때까지만 대기 (검색 결과는 서버에서 렌더링되므로 스크롤하지 않음)
+    element_found = True
+    try:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'search-product')))
+    except TimeoutException:
+        element_found = False
+    
+    page_source = driver.page_source
+    
+    # 봇 탐지 확인
+    if is_bot_check_page(page_source):
+        emit_log("봇 탐지 감지됨. 잠시 대기 후 재시도...")
+        gevent.sleep(random.uniform(15, 30))  # 더 긴 대기 시간
+        return None
+    
+    if not element_found:
+        emit_log("경고: 상품 목록을 찾을 수 없습니다.")
+        return None
+    
+    return page_source
+
+# 크롬 대체 수집용 드라이버 (모든 검색이 하나를 나눠 쓰고, 한 번에 한 검색만 사용)
+_chrome_driver = None
+_chrome_lock = BoundedSemaphore(1)
+
+def fetch_page_with_chrome(url):
+    """공유 크롬으로 페이지 가져오기 (드라이버가 없으면 처음 필요할 때 시작)"""
+    global _chrome_driver
+    with _chrome_lock:
+        if _chrome_driver is None:
+            _chrome_driver = setup_chrome_driver()
+            if _chrome_driver is None:
+                raise RuntimeError("드라이버 초기화 실패")
+        try:
+            return fetch_page_with_driver(_chrome_driver, url)
+        except Exception:
+            # 다음 재시도에서 브라우저를 새로 시작
+            try:
+                _chrome_driver.quit()
+            except:
+                pass
+            _chrome_driver = None
+            raise
+
+def close_chrome_driver():
+    """공유 크롬 종료 (검색 프로세스가 끝날 때 호출)"""
+    global _chrome_driver
+    with _chrome_lock:
+        if _chrome_driver:
+            try:
+                _chrome_driver.quit()
+            except:
+                pass
+            _chrome_driver = None
+
+def search_product(keyword, product_id):
+    """쿠팡에서 상품을 검색하고 순위를 찾는 함수 (여러 페이지를 HTTP로 동시에 요청)"""
     try:
         encoded_keyword = urllib.parse.quote(keyword)
-        base_url = f'https://www.coupang.com/np/search?component=&q={encoded_keyword}&channel=user'
-        
-        page = 1
+        skipped_pages = []
+        # 키워드별 전체 페이지 URL을 한 번만 만들어 두고 묶음 단위로 잘라 사용
+        all_urls = [SEARCH_URL.format(query=encoded_keyword, page=page) for page in range(1, MAX_PAGES + 1)]
         
-        while page <= 27:
-            try:
-                emit_log(f"\n{page}페이지 검색 중...")
-                url = f"{base_url}&page={page}"
-                
-                emit_log(f"URL 접속 시도: {url}")
-                driver.delete_all_cookies()
-                
-                # 사람처럼 랜덤한 대기 시간 추가
-                time.sleep(random.uniform(2, 4))
-                
-                driver.get(url)
-                
-                # 페이지 로드 후 자연스러운 대기
-                time.sleep(random.uniform(3, 5))
-                
-                # 페이지 로드 상태 확인
-                page_state = driver.execute_script('return document.readyState;')
-                emit_log(f"페이지 로드 상태: {page_state}")
-                
-                # 자연스러운 스크롤 동작
-                viewport_height = driver.execute_script("return window.innerHeight")
-                total_height = driver.execute_script("return document.body.scrollHeight")
-                
-                # 중간 중간 멈추면서 스크롤
-                current_position = 0
-                while current_position < total_height:
-                    # 다음 스크롤 위치 계산 (랜덤성 추가)
-                    scroll_amount = random.randint(300, 700)
-                    next_position = min(current_position + scroll_amount, total_height)
-                    
-                    # 부드럽게 스크롤
-                    smooth_scroll(driver, current_position, next_position)
-                    
-                    # 스크롤 후 잠시 대기 (컨텐츠 로딩 대기)
-                    time.sleep(random.uniform(0.5, 1.5))
-                    
-                    # 가끔 위로 살짝 스크롤 (사람처럼 보이게)
-                    if random.random() < 0.2:  # 20% 확률
-                        back_scroll = random.randint(100, 300)
-                        driver.execute_script(f"window.scrollBy(0, -{back_scroll});")
-                        time.sleep(random.uniform(0.3, 0.7))
-                    
-                    current_position = next_position
-                
-                # 요소 찾기 전 자연스러운 대기
-                time.sleep(random.uniform(1, 2))
-                
-                # 상품 목록 찾기
-                selectors = ["search-product", "search-product-link", "search-product-wrap"]
-                element_found = False
+        for first_page in range(1, MAX_PAGES + 1, PAGE_FETCH_CONCURRENCY):
+            pages = range(first_page, min(first_page + PAGE_FETCH_CONCURRENCY, MAX_PAGES + 1))
+            urls = all_urls[pages[0] - 1:pages[-1]]
+            emit_log(f"\n{pages[0]}~{pages[-1]}페이지 검색 중...")
+            
+            # 페이지들을 동시에 요청
+            jobs = [gevent.spawn(fetch_page, url) for url in urls]
+            gevent.joinall(jobs)
+            
+            # 순위 순서대로 분석
+            for page, url, job in zip(pages, urls, jobs):
+                page_source = job.value if job.successful() else None
+                if page_source is None:
+                    emit_log(f"페이지 {page} 요청 실패: {job.exception}")
                 
-                for selector in selectors:
-                    try:
-                        elements = WebDriverWait(driver, 10).until(
-                            EC.presence_of_all_elements_located((By.CLASS_NAME, selector))
-                        )
-                        if elements:
-                            element_found = True
-                            emit_log(f"요소 찾음: {selector}")
+                # 요청 실패나 봇 탐지 시에만 크롬으로 같은 페이지를 다시 시도
+                if page_source is None or is_bot_check_page(page_source):
+                    page_source = None
+                    for attempt in range(PAGE_RETRIES):
+                        try:
+                            page_source = fetch_page_with_chrome(url)
+                        except Exception as e:
+                            emit_log(f"페이지 {page} 검색 중 오류: {str(e)}")
+                            emit_log(f"오류 타입: {type(e).__name__}")
+                            continue
+                        if page_source is not None:
                             break
-                    except:
+                    if page_source is None:
+                        emit_log(f"페이지 {page}를 {PAGE_RETRIES}번 시도했지만 가져오지 못했습니다")
+                        skipped_pages.append(page)
                         continue
                 
-                if not element_found:
-                    emit_log("경고: 상품 목록을 찾을 수 없습니다.")
-                    continue
-                
-                # 페이지 소스 분석
-                page_source = driver.page_source
-                
-                # 봇 탐지 확인
-                if "보안 검사 중입니다" in page_source or "캡차" in page_source:
-                    emit_log("봇 탐지 감지됨. 잠시 대기 후 재시도...")
-                    time.sleep(random.uniform(15, 30))  # 더 긴 대기 시간
-                    continue
-                
-                soup = BeautifulSoup(page_source, 'html.parser')
+                soup = BeautifulSoup(page_source, HTML_PARSER)
                 result = analyze_page(soup, page, product_id)
                 
                 if result:
                     return result
-                
-                # 다음 페이지로 이동하기 전 자연스러운 대기
-                time.sleep(random.uniform(3, 5))
-                page += 1
-                
-            except Exception as e:
-                emit_log(f"페이지 {page} 검색 중 오류: {str(e)}")
-                emit_log(f"오류 타입: {type(e).__name__}")
-                
-                # 브라우저 재시작 전 충분한 대기
-                time.sleep(random.uniform(10, 20))
-                
-                try:
-                    driver.quit()
-                except:
-                    pass
-                
-                driver = setup_chrome_driver()
-                if driver is None:
-                    emit_log("드라이버 재초기화 실패")
-                    return None
-                
-                continue
         
-        emit_log(f"키워드: {keyword}, 상품 ID: {product_id}, 해당 상품을 찾을 수 없습니다. (27페이지 내)")
+        # 확인하지 못한 페이지가 있으면 '찾을 수 없음'으로 단정하지 않음
+        if skipped_pages:
+            emit_log(f"키워드: {keyword}, 상품 ID: {product_id}, 페이지 {skipped_pages}를 확인하지 못해 순위를 알 수 없습니다.")
+            return SEARCH_INCOMPLETE
+        
+        emit_log(f"키워드: {keyword}, 상품 ID: {product_id}, 해당 상품을 찾을 수 없습니다. ({MAX_PAGES}페이지 내)")
         return None
         
     except Exception as e:
@@ -306,7 +396,7 @@ def search_product(driver, keyword, product_id):
         emit_log(f"오류 타입: {type(e).__name__}")
         import traceback
         emit_log(f"상세 오류 추적:\n{traceback.format_exc()}")
-        return None
+        return SEARCH_INCOMPLETE
 
 scheduler = None # BackgroundScheduler()
 def setup_scheduler():
@@ -320,10 +410,34 @@ def setup_scheduler():
     except Exception as e:
         emit_log(f"스케줄러 설정 실패: {str(e)}")
 
+def search_row(item, total_items):
+    """키워드 하나 검색 (검색 풀에서 동시에 실행, 중지 요청 시 건너뜀)"""
+    indexes, keyword, product_id = item
+    if not search_active:
+        return indexes, keyword, None, False
+    
+    index = indexes[0]
+    emit_log(f"\n검색 시작 [{index + 1}/{total_items}]: {keyword} (상품 ID: {product_id})")
+    socketio.emit('search_status', {
+        'status': 'searching',
+        'current': index + 1,
+        'total': total_items,
+        'keyword': keyword,
+        'message': f'검색 중: {keyword}'
+    })
+    
+    return indexes, keyword, search_product(keyword, product_id), True
+
+def save_results(df, updates):
+    """모아 둔 검색 결과 {행 번호: 결과 값}을 한 번에 반영하고 엑셀 파일로 저장"""
+    df.loc[list(updates), RESULT_COLUMNS] = list(updates.values())
+    updates.clear()
+    df.to_excel(RANK_FILE, index=False)
+    socketio.emit('refresh_page', {})
+
 def perform_search():
     """실제 검색을 수행하는 함수"""
     global search_active
-    driver = None
     try:
         if not search_active:
             search_active = True
@@ -331,67 +445,58 @@ def perform_search():
         emit_log("검색 프로세스 시작")
         
         # 1. 엑셀 파일 로드
-        df = pd.read_excel('coupang_rank.xlsx')
+        df = pd.read_excel(RANK_FILE)
         emit_log(f"데이터 로드 완료: {len(df)}개 항목")
         
-        # 크롬 드라이버 설정
-        driver = setup_chrome_driver()
-        if driver is None:
-            emit_log("크롬 드라이버 초기화 실패")
-            return
-        
         try:
             total_items = len(df)
-            for index, row in df.iterrows():
-                if not search_active:
-                    break
-                
-                keyword = row['keyword']
-                product_id = str(row['product_id'])
-                
-                emit_log(f"\n검색 시작 [{index + 1}/{total_items}]: {keyword} (상품 ID: {product_id})")
-                socketio.emit('search_status', {
-                    'status': 'searching',
-                    'current': index + 1,
-                    'total': total_items,
-                    'keyword': keyword,
-                    'message': f'검색 중: {keyword}'
-                })
-                
-                # 검색 수행
-                result = search_product(driver, keyword, product_id)
+            
+            # 같은 (키워드, 상품 ID)는 한 번만 검색하고 결과를 해당하는 모든 행에 반영
+            groups = {}
+            for index, keyword, product_id in df[['keyword', 'product_id']].itertuples():
+                groups.setdefault((keyword, str(product_id)), []).append(index)
+            items = [(indexes, keyword, product_id) for (keyword, product_id), indexes in groups.items()]
+            if len(items) < total_items:
+                emit_log(f"중복 항목 {total_items - len(items)}개는 한 번만 검색합니다")
+            
+            # 결과 열이 없으면 추가 (결과는 저장할 때 한 번에 반영)
+            for column in RESULT_COLUMNS:
+                if column not in df.columns:
+                    df[column] = None
+            updates = {}
+            
+            # 키워드를 KEYWORD_CONCURRENCY 개씩 동시에 검색하고 끝나는 순서대로 반영
+            pool = Pool(KEYWORD_CONCURRENCY)
+            for indexes, keyword, result, searched in pool.imap_unordered(lambda item: search_row(item, total_items), items):
+                if not searched:
+                    continue
+                if result is SEARCH_INCOMPLETE:
+                    emit_log(f"순위를 확인하지 못해 기존 결과를 유지합니다: {keyword}")
+                    continue
                 
+                now = datetime.now()
                 if result:
-                    df.at[index, 'page'] = result['page']
-                    df.at[index, 'rank'] = result['rank']
-                    df.at[index, 'ad'] = 'O' if result['ad_count'] > 0 else '0'
-                    df.at[index, 'page_rank'] = result['rank']
-                    df.at[index, 'date'] = datetime.now().strftime('%Y-%m-%d')
-                    df.at[index, 'time'] = datetime.now().strftime('%H:%M:%S')
+                    values = (result['page'], result['rank'], 'O' if result['ad_count'] > 0 else '0',
+                              result['rank'], now.strftime('%Y-%m-%d'), now.strftime('%H:%M:%S'))
                     emit_log(f"상품 발견: 페이지 {result['page']}, 순위 {result['rank']}")
                 else:
-                    df.at[index, 'page'] = 0
-                    df.at[index, 'rank'] = 0
-                    df.at[index, 'ad'] = '0'
-                    df.at[index, 'page_rank'] = 0
-                    df.at[index, 'date'] = datetime.now().strftime('%Y-%m-%d')
-                    df.at[index, 'time'] = datetime.now().strftime('%H:%M:%S')
+                    values = (0, 0, '0', 0, now.strftime('%Y-%m-%d'), now.strftime('%H:%M:%S'))
                     emit_log(f"상품을 찾을 수 없습니다: {keyword}")
+                for index in indexes:
+                    updates[index] = values
                 
-                # 결과 저장
-                df.to_excel('coupang_rank.xlsx', index=False)
-                socketio.emit('refresh_page', {})
-                
-                # 다음 검색 전 대기
-                time.sleep(3)
+                # 결과 저장 (매번 전체 파일을 쓰지 않고 EXCEL_SAVE_EVERY 개마다 저장)
+                if len(updates) >= EXCEL_SAVE_EVERY:
+                    save_results(df, updates)
+            
+            if updates:
+                save_results(df, updates)
             
             emit_log("모든 검색이 완료되었습니다.")
             
         finally:
-            if driver:
-                driver.quit()
-            emit_log("크롬 드라이버 종료")
             search_active = False
+            close_chrome_driver()
             socketio.emit('search_status', {
                 'status': 'waiting',
                 'current': 0,
@@ -410,22 +515,26 @@ def perform_search():
             'keyword': '',
             'message': f'검색 프로세스 오류: {str(e)}'
         })
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+
+# 메인 페이지용 엑셀 내용 (파일 수정 시각이 바뀔 때만 다시 읽음)
+_rows_cache = {'mtime': None, 'rows': []}
+
+def load_rank_rows():
+    """엑셀 파일의 행 목록 반환 (파일이 바뀌지 않았으면 캐시 사용)"""
+    mtime = os.path.getmtime(RANK_FILE)
+    if _rows_cache['mtime'] != mtime:
+        _rows_cache['rows'] = pd.read_excel(RANK_FILE).to_dict('records')
+        _rows_cache['mtime'] = mtime
+    return _rows_cache['rows']
 
 @app.route('/')
 def index():
     """메인 페이지"""
     try:
-        df = pd.read_excel('coupang_rank.xlsx')
         return render_template('template.html', 
                              title='Coupang Rank Checker', 
                              message='쿠팡 순위 체커',
-                             data=df.to_dict('records'))
+                             data=load_rank_rows())
     except Exception as e:
         return f"오류 발생: {str(e)}"
 
@@ -437,11 +546,8 @@ def start_search():
         if not search_active:
             search_active = True
             emit_log("검색 시작")
-            # 검색 프로세스를 별도 스레드에서 실행
-            from threading import Thread
-            search_thread = Thread(target=perform_search)
-            search_thread.daemon = True
-            search_thread.start()
+            # 검색 프로세스를 별도 greenlet에서 실행 (웹소켓 서버와 같은 gevent 허브에서 동작)
+            gevent.spawn(perform_search)
             return jsonify({"status": "success"})
         return jsonify({"status": "error", "message": "이미 검색이 진행 중입니다."})
     except Exception as e:
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+쿠팡 일반 판매자 제품 검색 (스크래핑 부분)
+- GUI(PyQt5) 없이도 사용할 수 있도록 분리
+- Playwright를 사용한 웹 스크래핑
+"""
+
+import os
+import asyncio
+import heapq
+import random
+from operator import itemgetter
+
+try:
+    from playwright.async_api import async_playwright
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+
+# 쿠키/로컬스토리지 저장 파일 (다음 실행 시 메인 페이지 방문 생략)
+STATE_FILE = 'coupang_state.json'
+
+# 결과 필드와 표시용 열 이름
+RESULT_FIELDS = ('query', 'name', 'price', 'seller_type', 'rating', 'review_count', 'url')
+RESULT_HEADERS = ('검색어', '제품명', '가격', '판매자 유형', '평점', '리뷰 수', 'URL')
+
+# 브라우저 창 크기
+VIEWPORT = {'width': 1920, 'height': 1080}
+
+# 여러 키워드 검색 시 동시에 여는 페이지 수
+MAX_PARALLEL = 4
+
+# 브라우저 호출 제한 시간 (초) - 느린 네트워크에서 작업이 오래 멈추지 않도록
+GOTO_TIMEOUT = 25
+EVAL_TIMEOUT = 8
+
+# 가격 문자열에서 제거할 문자 (쉼표, 원, 공백 등)
+_PRICE_TBL = str.maketrans('', '', ', 원\t\n\r₩')
+
+# 결과 정렬 키
+_PRICE_KEY = itemgetter('price')
+
+# 로켓배송 계열 배지 (한 번의 탐색으로 모두 찾음)
+BADGE_SEL = '.badge.rocket, .badge.rocket-direct, .badge.rocket-global, .badge.rocket-fresh'
+
+# 검색 결과 제품 카드
+PRODUCT_SEL = 'li.search-product'
+
+# 검색 결과 카드에서 필요한 정보를 브라우저 안에서 한 번에 추출 (앞에서부터 limit 개만)
+PRODUCTS_JS = """
+(els, limit) => els.slice(0, limit).map(el => ({
+    name: el.querySelector('.name')?.innerText ?? null,
+    price: el.querySelector('.price-value')?.innerText ?? null,
+    badges: Array.from(el.querySelectorAll('%s'), e => e.className),
+    href: el.querySelector('a.search-product-link')?.getAttribute('href') ?? null,
+    rating: el.querySelector('.rating')?.innerText ?? null,
+    reviews: el.querySelector('.rating-total-count')?.innerText ?? null
+}))
+""" % BADGE_SEL
+
+# 제품 목록만 필요하므로 차단할 리소스 종류와 광고/분석 스크립트 주소
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+BLOCKED_URL_KEYWORDS = ('googletag', 'analytics', 'doubleclick', 'facebook', 'criteo', 'tiara')
+
+
+async def block_resources(route):
+    """이미지/미디어/폰트 및 광고/분석 요청 차단"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(k in request.url for k in BLOCKED_URL_KEYWORDS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class CoupangScraper:
+    """
+    쿠팡 검색 스크래퍼
+    - 브라우저 하나를 유지하고, 검색마다 새 컨텍스트만 생성
+    - 진행 상황은 on_progress 콜백으로 전달
+    """
+
+    def __init__(self, on_progress=print):
+        self.on_progress = on_progress
+        self.search_params = {}
+        self._playwright = None
+        self.browser = None
+        self.headless = None
+
+    async def start(self):
+        """Playwright 시작"""
+        self._playwright = await async_playwright().start()
+
+    async def close(self):
+        """브라우저와 Playwright 종료"""
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def search(self, search_params):
+        """검색 한 번 실행 (브라우저는 필요할 때만 다시 실행)"""
+        self.search_params = search_params
+        headless = search_params.get('headless', True)
+
+        if self._playwright is None:
+            await self.start()
+
+        # 처음이거나 브라우저가 죽었거나 헤드리스 설정이 바뀐 경우에만 브라우저 실행
+        if self.browser is None or not self.browser.is_connected() or self.headless != headless:
+            if self.browser is not None and self.browser.is_connected():
+                await self.browser.close()
+            self.headless = headless
+            # 브라우저 실행 - 실제 브라우저처럼 설정
+            self.browser = await self._playwright.chromium.launch(
+                headless=headless,
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-dev-shm-usage',
+                    '--no-sandbox'
+                ]
+            )
+
+        return await self.scrape_coupang(self.browser, search_params['query'])
+
+    @property
+    def fast_mode(self):
+        """빠른 모드 여부 (기본값: 헤드리스 실행 시 사용)"""
+        return self.search_params.get('fast_mode', self.search_params.get('headless', True))
+
+    async def random_delay(self, min_sec=None, max_sec=None):
+        """사람처럼 보이기 위한 랜덤 딜레이 (빠른 모드에서는 생략)"""
+        if self.fast_mode:
+            return
+        if min_sec is None:
+            min_sec = self.search_params.get('min_delay', 2.0)
+        if max_sec is None:
+            max_sec = self.search_params.get('max_delay', 5.0)
+        delay = random.uniform(min_sec, max_sec)
+        await asyncio.sleep(delay)
+
+    async def smooth_scroll(self, page, scroll_amount=300):
+        """부드러운 스크롤 시뮬레이션 (빠른 모드에서는 생략)"""
+        if self.fast_mode:
+            return
+        for _ in range(3):
+            await page.evaluate(f'window.scrollBy(0, {scroll_amount})')
+            await asyncio.sleep(random.uniform(0.3, 0.7))
+
+    async def human_like_mouse_move(self, page):
+        """사람처럼 마우스를 움직임 (빠른 모드에서는 생략)"""
+        if self.fast_mode:
+            return
+        # 창 크기는 컨텍스트 설정값을 사용 (브라우저에 묻지 않음)
+        size = page.viewport_size or VIEWPORT
+        x = random.randint(100, size['width'] - 100)
+        y = random.randint(100, size['height'] - 100)
+        await page.mouse.move(x, y)
+        await asyncio.sleep(random.uniform(0.1, 0.3))
+
+    async def scrape_coupang(self, browser, queries):
+        """쿠팡 웹사이트 스크래핑 - 여러 키워드를 하나의 브라우저 컨텍스트에서 동시에 검색"""
+        if isinstance(queries, str):
+            queries = [queries]
+
+        # 프록시 설정
+        context_options = {
+            'viewport': VIEWPORT,
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'locale': 'ko-KR',
+            'timezone_id': 'Asia/Seoul'
+        }
+
+        # 프록시 사용 시
+        if self.search_params.get('use_proxy', False) and self.search_params.get('proxy_server'):
+            proxy_server = self.search_params.get('proxy_server')
+            self.on_progress(f"프록시 사용: {proxy_server}")
+            context_options['proxy'] = {'server': proxy_server}
+
+        # 저장된 쿠키가 있으면 재사용
+        warm = os.path.exists(STATE_FILE)
+        if warm:
+            context_options['storage_state'] = STATE_FILE
+
+        # 새 컨텍스트 생성 - 실제 사용자처럼
+        context = await browser.new_context(**context_options)
+        await context.route('**/*', block_resources)
+
+        # 웹드라이버 감지 방지
+        await context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+
+            window.navigator.chrome = {
+                runtime: {}
+            };
+
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => [1, 2, 3, 4, 5]
+            });
+
+            Object.defineProperty(navigator, 'languages', {
+                get: () => ['ko-KR', 'ko', 'en-US', 'en']
+            });
+        """)
+
+        try:
+            # 동시에 여는 페이지 수 제한
+            sem = asyncio.Semaphore(MAX_PARALLEL)
+
+            async def bounded(query):
+                async with sem:
+                    return await self.scrape_one(context, query, warm)
+
+            results = []
+            for query_results in await asyncio.gather(*(bounded(q) for q in queries)):
+                results.extend(query_results)
+
+            # 결과를 얻은 검색만 다음 검색을 위해 쿠키 저장 (차단되거나 실패한 세션은 저장하지 않음)
+            if results:
+                try:
+                    await context.storage_state(path=STATE_FILE)
+                except Exception as e:
+                    self.on_progress(f"쿠키 저장 중 오류: {str(e)}")
+
+        finally:
+            await context.close()
+
+        # 가격 순으로 정렬 (키워드당 최대 max_results 개)
+        limit = self.search_params.get('max_results', 20) * len(queries)
+        return heapq.nsmallest(limit, results, key=_PRICE_KEY)
+
+    async def scrape_one(self, context, query, warm=False):
+        """키워드 하나를 새 페이지에서 검색 - 사람처럼 행동"""
+        results = []
+        max_results = self.search_params.get('max_results', 20)
+        min_price = self.search_params.get('min_price', 0)
+        max_price = self.search_params.get('max_price', 999999999)
+
+        # 제외할 배지 클래스를 미리 모아 두고 카드마다 한 번에 비교
+        excluded_badges = set()
+        if self.search_params.get('exclude_rocket', True):
+            excluded_badges.add('rocket')
+        if self.search_params.get('exclude_rocket_direct', True):
+            excluded_badges.update(('rocket-direct', 'rocket-global', 'rocket-fresh'))
+
+        self.on_progress(f"'{query}' 검색 중...")
+
+        page = await context.new_page()
+        # 제한 시간을 따로 주지 않은 브라우저 호출도 EVAL_TIMEOUT 안에 끝나도록
+        page.set_default_timeout(EVAL_TIMEOUT * 1000)
+
+        try:
+            # 쿠키가 없을 때만 쿠팡 메인 페이지 먼저 방문 (실제 사용자처럼)
+            if not warm:
+                self.on_progress("쿠팡 메인 페이지 접속 중...")
+                await page.goto("https://www.coupang.com", wait_until='commit', timeout=GOTO_TIMEOUT * 1000)
+
+                # 초기 대기 시간 (IP 차단 방지)
+                initial_wait = self.search_params.get('initial_wait', 3.0)
+                self.on_progress(f"페이지 로딩 대기 중... ({initial_wait:.1f}초)")
+                await asyncio.sleep(initial_wait)
+                await self.random_delay()
+
+                # 마우스 움직임 시뮬레이션
+                await self.human_like_mouse_move(page)
+
+            # 검색 페이지로 이동
+            search_url = f"https://www.coupang.com/np/search?q={query}"
+            self.on_progress(f"'{query}' 검색 중...")
+
+            await page.goto(search_url, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT * 1000)
+            await self.random_delay()  # 설정된 딜레이 사용
+
+            if self.fast_mode:
+                # 제품 목록이 어느 정도 채워질 때까지만 짧게 대기
+                await page.wait_for_selector(PRODUCT_SEL, timeout=8000)
+                try:
+                    await page.wait_for_function(
+                        "document.querySelectorAll('li.search-product').length > 5", timeout=8000)
+                except PlaywrightTimeoutError:
+                    pass
+            else:
+                # 페이지를 천천히 스크롤 (실제 사람처럼)
+                self.on_progress("페이지 스크롤 중...")
+                scroll_delay = self.search_params.get('scroll_delay', 1.5)
+                await self.smooth_scroll(page, 200)
+                await asyncio.sleep(scroll_delay)
+
+                # 제품 목록이 로딩될 때까지 대기
+                await page.wait_for_selector(PRODUCT_SEL, timeout=30000)
+
+            self.on_progress("제품 정보 수집 중...")
+
+            # 제품 목록 가져오기 (필터링을 고려해 더 많이 수집, evaluate 에는 Playwright 제한 시간이 없어 직접 제한)
+            try:
+                products = await asyncio.wait_for(
+                    page.eval_on_selector_all(PRODUCT_SEL, PRODUCTS_JS, max_results * 2), EVAL_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.on_progress(f"제품 정보 수집 시간 초과 ({EVAL_TIMEOUT}초)")
+                return results
+
+            if not products:
+                self.on_progress("검색 결과가 없습니다.")
+                return results
+
+            self.on_progress(f"{len(products)}개 제품 발견. 필터링 중...")
+
+            for idx, product in enumerate(products):
+                try:
+                    # 각 제품을 볼 때마다 짧은 딜레이 (사람처럼)
+                    if idx % 5 == 0 and idx > 0:
+                        await self.random_delay(0.5, 1.5)
+                        # 가끔 마우스 움직임 (응답이 늦으면 건너뜀)
+                        try:
+                            await asyncio.wait_for(self.human_like_mouse_move(page), EVAL_TIMEOUT)
+                        except asyncio.TimeoutError:
+                            pass
+                    # 로켓배송 체크 (배지 클래스 이름으로 분류)
+                    badge_classes = set()
+                    for class_name in product['badges']:
+                        badge_classes.update(class_name.split())
+                    is_rocket = 'rocket' in badge_classes
+                    is_rocket_direct = 'rocket-direct' in badge_classes
+                    is_rocket_global = 'rocket-global' in badge_classes
+                    is_rocket_fresh = 'rocket-fresh' in badge_classes
+
+                    # 필터링 조건 체크
+                    if badge_classes & excluded_badges:
+                        continue
+
+                    # 제품 정보 추출
+                    name = product['name'] or "제목 없음"
+
+                    price_text = product['price'] or "0"
+                    try:
+                        price = int(price_text.translate(_PRICE_TBL))
+                    except ValueError:
+                        continue
+
+                    # 가격 필터링
+                    if price < min_price or price > max_price:
+                        continue
+
+                    # 링크 추출
+                    href = product['href']
+                    product_url = ""
+                    if href:
+                        product_url = f"https://www.coupang.com{href}" if href.startswith('/') else href
+
+                    # 평점 추출
+                    rating = product['rating'] or "N/A"
+
+                    # 리뷰 수 추출
+                    review_count = product['reviews'] or "0"
+
+                    # 판매자 정보
+                    seller_type = "일반 판매자"
+                    if is_rocket:
+                        seller_type = "로켓배송"
+                    elif is_rocket_direct:
+                        seller_type = "로켓직구"
+                    elif is_rocket_global:
+                        seller_type = "로켓글로벌"
+                    elif is_rocket_fresh:
+                        seller_type = "로켓프레시"
+
+                    results.append({
+                        'query': query,
+                        'name': name.strip(),
+                        'price': price,
+                        'seller_type': seller_type,
+                        'rating': rating.strip(),
+                        'review_count': review_count.strip(),
+                        'url': product_url
+                    })
+
+                    self.on_progress(f"처리 중... {len(results)}개 일반 판매자 제품 발견")
+
+                    # 목표 개수 달성 시 중단
+                    if len(results) >= max_results:
+                        break
+
+                except Exception as e:
+                    self.on_progress(f"제품 처리 중 오류: {str(e)}")
+                    continue
+
+        except Exception as e:
+            self.on_progress(f"페이지 처리 중 오류: {str(e)}")
+        finally:
+            await page.close()
+
+        return results
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+selectolax 노드 텍스트 추출
+- 브라우저의 innerText 처럼 블록 요소 경계에서만 줄을 나눔
+- 브라우저 없이 받은 HTML 도 innerText 기준 정규식으로 그대로 파싱할 수 있도록 사용
+"""
+
+import re
+
+# 앞뒤로 줄이 바뀌는 요소
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+    'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul'
+})
+
+# 화면에 보이지 않는 요소
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _collect(node, parts):
+    """노드의 텍스트 조각을 parts 에 추가 (블록 요소는 앞뒤에 줄바꿈)"""
+    for child in node.iter(include_text=True):
+        tag = child.tag
+        if tag == '-text':
+            # 소스의 들여쓰기/줄바꿈은 공백 하나로
+            parts.append(_SPACE_RE.sub(' ', child.text(deep=False)))
+        elif tag == 'br':
+            parts.append('\n')
+        elif tag.startswith('-') or tag in SKIP_TAGS:
+            continue
+        elif tag in BLOCK_TAGS:
+            parts.append('\n')
+            _collect(child, parts)
+            parts.append('\n')
+        else:
+            _collect(child, parts)
+
+
+def inner_text(node):
+    """innerText 와 비슷한 텍스트 반환 (줄마다 공백 정리, 빈 줄 제거)"""
+    parts = []
+    _collect(node, parts)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
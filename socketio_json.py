@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Socket.IO 페이로드 직렬화
+- orjson 이 설치되어 있으면 SocketIO(json=...) 에 orjson 을 사용
+- 웹 서버들(11.coupang_wing_web.py, 순위 검색 서버)이 함께 사용
+"""
+
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonSocketIOJSON:
+    """Socket.IO 페이로드 직렬화용 json 모듈 대체 (orjson 사용, 추가 인자는 무시)"""
+
+    def __init__(self, option=None):
+        self.option = option
+
+    def dumps(self, obj, *args, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode('utf-8')
+
+    def loads(self, s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+def socketio_json_module(option=None):
+    """SocketIO(json=...) 에 넘길 모듈 반환 (orjson 이 없으면 표준 json, option 은 orjson.OPT_* 값)"""
+    return OrjsonSocketIOJSON(option) if ORJSON_AVAILABLE else json
@@ -0,0 +1,75 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('playwright')
+pytest.importorskip('selectolax.parser')
+pytest.importorskip('httpx')
+
+
+def load_script(filename, name):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# 금액/단위/전환율이 각각 다른 태그에 들어 있는 카드
+CARD_HTML = """
+<a href="/pc/camp/camp_view.html?idx=77">
+  <img src="/upload/77.png" alt="포장이사 견적 상담">
+  <div class="category">이사</div>
+  <div class="title">포장이사 <em>견적</em> 상담</div>
+  <p>CPA <b>12,000</b>원 <span>[평균 <i>35</i>%]</span></p>
+  <p>오늘잔여 <b>20</b></p>
+  <p>격려금 <b>1,000</b>원 지급</p>
+</a>
+"""
+
+# 같은 카드를 브라우저에서 CARDS_JS 로 추출했을 때의 innerText
+CARD_INNER_TEXT = '이사\n포장이사 견적 상담\nCPA 12,000원 [평균 35%]\n오늘잔여 20\n격려금 1,000원 지급'
+
+
+def test_dbanalyzer_fast_path_matches_inner_text():
+    dbanalyzer = load_script('1.dbanalyzer.py', 'dbanalyzer')
+    browser_card = {
+        'href': '/pc/camp/camp_view.html?idx=77',
+        'text': CARD_INNER_TEXT,
+        'img': '/upload/77.png',
+        'alt': '포장이사 견적 상담',
+        'category': '이사',
+        'title': '포장이사 견적 상담',
+        'strong': None
+    }
+
+    fast = dbanalyzer.parse_cards(dbanalyzer.parse_html_cards(CARD_HTML), 'CPA')
+    browser = dbanalyzer.parse_cards([browser_card], 'CPA')
+    for campaign in fast + browser:
+        campaign.pop('scraped_at')
+
+    assert fast == browser
+    assert fast[0]['cpa_price'] == 'CPA 12,000원'
+    assert fast[0]['avg_conversion_rate'] == '[평균 35%]'
+    assert fast[0]['incentive'] == '격려금 1,000원 지급'
+
+
+def test_adpot_fast_path_matches_inner_text(monkeypatch, tmp_path):
+    pytest.importorskip('xlsxwriter')
+    adpot = load_script('.1adpot.py', 'adpot')
+    browser_card = {
+        'href': '/pc/camp/camp_view.html?idx=77',
+        'text': CARD_INNER_TEXT,
+        'img': '/upload/77.png',
+        'category': '이사',
+        'title': '포장이사 견적 상담'
+    }
+
+    response = type('Response', (), {'text': CARD_HTML, 'raise_for_status': lambda self: None})()
+    monkeypatch.setattr(adpot.httpx, 'get', lambda *args, **kwargs: response)
+    monkeypatch.chdir(tmp_path)
+    fast = adpot.scrape_cpa_list_fast()
+
+    assert fast == adpot.parse_cards([browser_card])
+    assert fast[0]['cpa_price'] == 'CPA 12,000원'
@@ -0,0 +1,40 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('playwright')
+
+
+def load_dbanalyzer():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '1.dbanalyzer.py')
+    spec = importlib.util.spec_from_file_location('dbanalyzer', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+dbanalyzer = load_dbanalyzer()
+
+TITLES = {
+    '온라인상담 이벤트': '온라인, 상담, 온라인상담',
+    '성장판 검사': '성장판, 성장',
+    '포장이사 견적 비교': '이사, 포장이사, 비교, 견적',
+    '한의원 침향 공진단': '의원, 한의원, 침향',
+    '관련 없는 제목': '',
+}
+
+
+@pytest.mark.parametrize('title, expected', TITLES.items())
+def test_extract_keywords_finds_nested_keywords(monkeypatch, title, expected):
+    monkeypatch.setattr(dbanalyzer, 'AHOCORASICK_AVAILABLE', False)
+    assert dbanalyzer.extract_keywords(title) == expected
+
+
+@pytest.mark.parametrize('title', TITLES)
+def test_extract_keywords_automaton_matches_fallback(monkeypatch, title):
+    if not dbanalyzer.AHOCORASICK_AVAILABLE:
+        pytest.skip('pyahocorasick 미설치')
+    with_automaton = dbanalyzer.extract_keywords(title)
+    monkeypatch.setattr(dbanalyzer, 'AHOCORASICK_AVAILABLE', False)
+    assert dbanalyzer.extract_keywords(title) == with_automaton